@@ -1,27 +1,21 @@
 import streamlit as st
 import plotly.graph_objs as go
 import pandas as pd
-from datetime import datetime, timedelta, date
-from financial_plan import filter_plans_by_date, filter_loans_by_date, calculateMonthlyFinalPayment
-from graph import display_timeline, display_piechart
-from db import authenticate, signup, logout, deletePlan, showChosenPages, getUserInfo, getUserPlans, getTotalSavings, logout, createSaving
+from datetime import datetime, date
+from financial_plan import filter_plans_by_date, filter_loans_by_date, calculateMonthlyFinalPayment, monthly_savings_series, COUNTRY_DATA
+from graph import display_timeline, display_piechart, create_budget_allocation_graph
+from db import authenticate, signup, deletePlan, getUserOverview, getBudgetAllocation, createSaving
+from bootstrap import setupPage, finishPage
 import time
 
 # Set page title and icon
 st.set_page_config(page_title="Goaldigger", page_icon=":moneybag:")
 
-showChosenPages()
-
 # Way one
 sidebar_logo = "img/Logo_Without_Text.png"
 st.logo(sidebar_logo, link="https://goaldigger.streamlit.app/", icon_image="img/Logo_Without_Text.png")
 
-def load_css(file_path):
-    with open(file_path) as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-
-css_file_path = "data/titlestyle.css"
-load_css(css_file_path)
+setupPage(__file__, require_login=False)
 
 def login_page():
       # Google Fonts
@@ -120,13 +114,13 @@ def login_page():
          password = st.text_input("New Password", type="password")
          if st.button("Sign Up"):
             # Function to add user to database
-            if signup(username, password):
+            user_id = signup(username, password)
+            if user_id:
                   st.balloons()
                   st.success("User created successfully!")
                   st.session_state.signup_mode = False
                   # Automatically logging in
-                  user = authenticate(username, password)
-                  st.session_state.user_id = user.user_id
+                  st.session_state.user_id = user_id
                   st.session_state.logged_in = True
                   time.sleep(0.5)
                   st.switch_page("pages/1_Personal_Information.py")
@@ -143,17 +137,13 @@ def main():
       st.session_state.logged_in = False
     
     if st.session_state.logged_in:
-      
-      logout()
 
       # Helper function to get a list of years
       def get_years(start_year, end_year):
          return [str(year) for year in range(start_year, end_year + 1)]
 
       @st.experimental_dialog("📊 Add Saving Progress")
-      def add_saving(user_id, plan):
-         profile = getUserInfo(user_id)
-
+      def add_saving(user_id, plan, profile):
          st.header(f"Plan: {plan.goal_name}")
          months = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
          years = get_years(datetime.now().year - 3, datetime.now().year + 7)
@@ -190,8 +180,9 @@ def main():
       # PREPARATION
       # Get user info
       user_id = st.session_state.user_id
-      profile = getUserInfo(user_id)
-      plans = getUserPlans(user_id)
+      overview = getUserOverview(user_id)
+      profile = overview.profile
+      plans = overview.plans
 
       # ---- OVERVIEW ---
       if not plans:
@@ -266,26 +257,16 @@ def main():
          total_amount = total_monthly_savings + total_monthly_loans
 
          # Display Pie chart
-         display_piechart(user_id, savings_distribution)
+         display_piechart(overview, savings_distribution)
 
          # Display Timeline
-         display_timeline(user_id)
+         display_timeline(overview)
 
          # Check if filtered_plans is not empty
          if filtered_plans:
             # Graph for total savings over time
-            savings_data = {'Date': [], 'Total Savings': []}
-            start_date = datetime.today()
             end_date = max(plan.goal_date if isinstance(plan.goal_date, datetime) else datetime.combine(plan.goal_date, datetime.min.time()) for plan in filtered_plans)
-            current_date = start_date
-
-            while current_date <= end_date:
-               current_monthly_savings = sum(plan.goal_target_monthly for plan in filter_plans_by_date(plans, current_date))
-               savings_data['Date'].append(current_date)
-               savings_data['Total Savings'].append(current_monthly_savings)
-               current_date += timedelta(days=30)  # Move to next month
-
-            savings_df = pd.DataFrame(savings_data)
+            savings_df = monthly_savings_series(plans, datetime.today(), end_date)
 
             # Create the figure
             fig_savings = go.Figure()
@@ -311,6 +292,38 @@ def main():
          else:
             st.info("No plans available to display the savings graph.")
 
+         # Monthly budget: which goals a cap on the total monthly saving can reach, in the order above
+         st.markdown(
+             f"""
+             <h2 class="custom-subheader">Monthly Budget</h2>
+             """,
+             unsafe_allow_html=True
+         )
+         upcoming_plans = filter_plans_by_date(plans, datetime.combine(date.today(), datetime.min.time()))
+         if upcoming_plans:
+            inflation_rate = COUNTRY_DATA.get(profile.user_country, COUNTRY_DATA['Germany'])['Inflation rate']
+            monthly_budget = st.number_input(f"How much can you save per month in total? ({profile.user_currency})", min_value=0.0, step=100.0,
+                                             value=float(round(sum(plan.goal_target_monthly for plan in upcoming_plans))), key='monthly_budget')
+
+            # Plans in the order chosen under "Rearrange Plans", the ones left out last
+            ranked_plans = sorted(upcoming_plans, key=lambda plan: plan_order.index(plan.goal_name) if plan.goal_name in plan_order else len(plan_order))
+            allocation = getBudgetAllocation(user_id, tuple(plan.plan_id for plan in ranked_plans), monthly_budget, inflation_rate, date.today())
+
+            st.metric("Goals within budget", f"{int(allocation.funded.sum())} of {len(ranked_plans)}")
+            if not allocation.optimal:
+                st.info("This is the best split found in the time available, another one might reach more goals.")
+            st.caption(f"Targets grow with {inflation_rate}% inflation a year. Each goal within budget gets an even monthly saving until it is due. Loan payments come on top of the budget.")
+            st.dataframe(pd.DataFrame({
+               'Plan': [plan.goal_name for plan in ranked_plans],
+               'Due Date': [plan.goal_date.strftime('%d.%m.%Y') for plan in ranked_plans],
+               f'Needed on its own ({profile.user_currency})': allocation.required,
+               f'This month ({profile.user_currency})': allocation.contributions.iloc[0].values,
+               'Reached': ['✅' if funded else '❌' for funded in allocation.funded],
+            }), hide_index=True)
+            create_budget_allocation_graph(allocation, {plan.plan_id: plan.goal_name for plan in ranked_plans}, monthly_budget, profile.user_currency)
+         else:
+            st.info("All plans are due, there is nothing left to save for.")
+
          # Show each plan
          # Plans with loans
          st.markdown(
@@ -320,7 +333,7 @@ def main():
              unsafe_allow_html=True
          )
          for i, plan in enumerate([plan for plan in plans]): 
-            total_saving = getTotalSavings(user_id, plan.plan_id) + plan.saving_initial
+            total_saving = overview.total_savings.get(plan.plan_id, 0) + plan.saving_initial
             rest_saving = plan.goal_target - total_saving  
             with st.container(border=True):
                col1_1, col1_2, col1_3 = st.columns([3, 1, 1.2])
@@ -383,10 +396,11 @@ def main():
                with col1_2:
                   if st.button(f"✅ Add Saving", key=f"add_saving_{plan.plan_id}_{i}"):
                      st.session_state.add_saving_plan_id = plan.plan_id
-                     add_saving(user_id, plan)
+                     add_saving(user_id, plan, profile)
 
     else:
          login_page()
 
 if __name__ == "__main__":
     main()
+    finishPage()
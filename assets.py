@@ -0,0 +1,36 @@
+import base64
+import io
+import streamlit as st
+from PIL import Image
+
+### STATIC ASSETS ###
+# The stylesheet and the images embedded as base64 are read and encoded once per process,
+# not on every rerun. Images can be downscaled to the width they are displayed at first.
+
+CSS_PATH = "data/titlestyle.css"
+
+@st.cache_resource
+def _read_css(file_path):
+    with open(file_path) as f:
+        return f"<style>{f.read()}</style>"
+
+def load_css(file_path=CSS_PATH):
+    try:
+        st.markdown(_read_css(file_path), unsafe_allow_html=True)
+    except FileNotFoundError:
+        st.error(f"CSS file not found: {file_path}")
+
+@st.cache_resource
+def get_base64_image(image_path, max_width=None):
+    with open(image_path, "rb") as image_file:
+        data = image_file.read()
+
+    if max_width is not None:
+        image = Image.open(io.BytesIO(data))
+        if image.width > max_width:
+            height = max(1, round(image.height * max_width / image.width))
+            buffer = io.BytesIO()
+            image.resize((max_width, height), Image.LANCZOS).save(buffer, format="PNG", optimize=True)
+            data = buffer.getvalue()
+
+    return base64.b64encode(data).decode()
@@ -0,0 +1,53 @@
+import os
+import sys
+import timeit
+from datetime import date
+import numpy as np
+import numpy_financial as npf
+import pandas as pd
+
+# Run from anywhere: python benchmarks/bench_amortization.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph import calculate_amortization_schedule
+
+# The month-by-month loop calculate_amortization_schedule used to run, kept as the reference
+def loop_amortization_schedule(loan_amount, annual_interest_rate, loan_term_years, start_date):
+    monthly_interest_rate = annual_interest_rate / 100 / 12
+    number_of_payments = loan_term_years * 12
+    monthly_payment = np.abs(npf.pmt(monthly_interest_rate, number_of_payments, loan_amount))
+
+    schedule = []
+    balance = loan_amount
+    for i in range(number_of_payments):
+        interest = balance * monthly_interest_rate
+        principal = monthly_payment - interest
+        balance -= principal
+        if balance < 0:
+            balance = 0
+        schedule.append({
+            'Month': start_date + pd.DateOffset(months=i),
+            'Payment': monthly_payment,
+            'Principal': principal,
+            'Interest': interest,
+            'Balance': balance
+        })
+    return pd.DataFrame(schedule)
+
+CASES = [
+    (250000.0, 5.7, 20, date(2024, 1, 31)),
+    (400000.0, 3.2, 50, date(2025, 8, 29)),
+    (18000.0, 0.0, 5, date(2024, 2, 29)),
+    (30000.0, 12.5, 2, date(2026, 3, 1)),
+]
+
+if __name__ == "__main__":
+    for case in CASES:
+        expected = loop_amortization_schedule(*case)
+        actual = calculate_amortization_schedule(*case)
+        # Balances near zero differ by float noise only, hence the absolute tolerance
+        pd.testing.assert_frame_equal(actual, expected, check_exact=False, rtol=1e-9, atol=1e-6)
+
+        loop_time = min(timeit.repeat(lambda: loop_amortization_schedule(*case), number=5, repeat=3)) / 5
+        vector_time = min(timeit.repeat(lambda: calculate_amortization_schedule(*case), number=5, repeat=3)) / 5
+        print(f"{case[2]:>2} years at {case[1]:>4}%: loop {loop_time * 1000:8.2f} ms, "
+              f"vectorized {vector_time * 1000:6.2f} ms, {loop_time / vector_time:6.1f}x faster, schedules match")
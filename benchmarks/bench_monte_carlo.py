@@ -0,0 +1,26 @@
+import argparse
+import os
+import sys
+import time
+
+# Run from anywhere: python benchmarks/bench_monte_carlo.py [--paths 10000] [--months 480]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from financial_plan import calculate_monthly_saving
+from monte_carlo import simulate_goal
+
+# Time per simulation of a retirement-sized plan, best of --repeat runs
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--paths", type=int, default=10000)
+    parser.add_argument("--months", type=int, default=480)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    monthly_saving, _ = calculate_monthly_saving(600000, 20000, 4.0, args.months, 2.0)
+    timings = []
+    for seed in range(args.repeat):
+        start = time.perf_counter()
+        result = simulate_goal(600000, 20000, monthly_saving, args.months, 4.0, 10.0, 2.0, paths=args.paths, seed=seed)
+        timings.append(time.perf_counter() - start)
+    print(f"{args.paths} paths x {args.months} months: best {min(timings) * 1000:.0f} ms, "
+          f"worst {max(timings) * 1000:.0f} ms, chance of success {result.probability:.1%}")
@@ -0,0 +1,141 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+
+# Run from anywhere: python benchmarks/bench_pages.py [--database-url URL] [--reruns 3]
+#
+# Renders the overview, create plan and edit plan pages with streamlit's AppTest for users with
+# 1, 10 and 100 plans and up to 10k savings, and reports wall time, query count and peak Python
+# memory per rerun. The first rerun starts with an empty query cache, the later ones show the
+# warm path. Each scenario's user is generated by synthetic_data.py from --seed and --as-of, so runs
+# with the same seed and reference date render the same plans. By default the data lives in a fresh SQLite file; pass
+# --database-url to use a PostgreSQL stand-in instead. Results are written as JSON to benchmarks/results/.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic_data import generate, load
+
+# (name, plans, monthly savings per plan)
+SCENARIOS = [
+    ("1 plan, no savings", 1, 0),
+    ("1 plan, 120 savings", 1, 120),
+    ("10 plans, 1k savings", 10, 100),
+    ("100 plans, 10k savings", 100, 100),
+]
+
+PAGES = ["Goaldigger.py", "pages/2_Create_Plan.py", "pages/3_Edit_Plan.py"]
+
+# Reference date of the generated ages, goal dates and saving histories, fixed so that runs on
+# different days are comparable
+AS_OF = date(2026, 1, 1)
+
+def seed_user(db, username, plans, months, seed, as_of):
+    # One generated user with exactly this many plans and months of savings per plan
+    data = generate(1, plans_per_user=plans, savings_months=months, seed=seed, as_of=as_of, missed_share=0)
+    user_ids, plan_ids = load(db.engine, data, username_prefix=username)
+    return int(user_ids[0]), [int(plan_id) for plan_id in plan_ids]
+
+def render(AppTest, db, page, state, reruns, trace_memory):
+    # One AppTest session, rerun several times; the first rerun starts with an empty query cache
+    db.query_cache.clear()
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=300)
+    for key, value in state.items():
+        at.session_state[key] = value
+
+    measurements = []
+    for rerun in range(reruns):
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        at.run()
+        wall = time.perf_counter() - start
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        # A page that fails before setupPage has no query run to report
+        query_run = at.session_state.get("query_run")
+        report = query_run.report() if query_run is not None else {"queries": None, "query_ms": None}
+        error = at.exception[0].message if at.exception else None
+        if query_run is None and error is None:
+            error = "the page did not start a query run"
+        measurements.append({
+            "wall_ms": round(wall * 1000, 2),
+            "queries": report["queries"],
+            "query_ms": report["query_ms"],
+            "peak_kib": round(peak / 1024, 1) if peak is not None else None,
+            "error": error,
+        })
+    return measurements
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", help="defaults to a new SQLite file in a temporary directory")
+    parser.add_argument("--reruns", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generated users and plans")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=AS_OF, help=f"reference date of the generated data, defaults to {AS_OF}")
+    parser.add_argument("--output", help="defaults to benchmarks/results/bench_pages-<timestamp>.json")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    # The pages open data/ and img/ relative to the repository root
+    os.chdir(ROOT)
+
+    # db reads DATABASE_URL when it is imported
+    import db
+    import streamlit
+    from migrate import migrate
+    from streamlit.testing.v1 import AppTest
+
+    logging.getLogger("goaldigger").setLevel(logging.WARNING)
+    migrate(db.engine)
+
+    run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+    results = []
+    for name, plans, months in SCENARIOS:
+        seed_start = time.perf_counter()
+        user_id, plan_ids = seed_user(db, f"bench-{run_id}-{plans}-{months}", plans, months, args.seed, args.as_of)
+        print(f"{name}: seeded in {time.perf_counter() - seed_start:.1f} s")
+
+        for page in PAGES:
+            state = {"logged_in": True, "user_id": user_id, "edit_plan_id": plan_ids[0]}
+            timings = render(AppTest, db, page, state, args.reruns, trace_memory=False)
+            memory = render(AppTest, db, page, state, args.reruns, trace_memory=True)
+            for rerun, (timing, traced) in enumerate(zip(timings, memory)):
+                timing["peak_kib"] = traced["peak_kib"]
+                results.append({"scenario": name, "plans": plans, "savings": plans * months, "page": page, "rerun": rerun, **timing})
+                queries = f"{timing['queries']:3} queries ({timing['query_ms']:7.1f} ms)" if timing["queries"] is not None else "no query run"
+                print(f"  {page:<24} rerun {rerun}: {timing['wall_ms']:9.1f} ms, {queries}, peak {timing['peak_kib']:9.1f} KiB"
+                      + (f"  ERROR {timing['error']}" if timing["error"] else ""))
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"bench_pages-{run_id}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "meta": {
+                "run_id": run_id,
+                "git_revision": git_revision(),
+                "database": db.engine.dialect.name,
+                "reruns": args.reruns,
+                "seed": args.seed,
+                "as_of": args.as_of.isoformat(),
+                "python": platform.python_version(),
+                "streamlit": streamlit.__version__,
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {output}")
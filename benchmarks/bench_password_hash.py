@@ -0,0 +1,35 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Run from anywhere: python benchmarks/bench_password_hash.py [--n 16384] [--logins 64]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from passwords import PasswordHasher
+
+# Logins per second for the password check alone, at the given scrypt cost, with 32 sessions
+# logging in at once and the hashing pool capped at different sizes
+def logins_per_second(hasher, stored, logins, sessions=32):
+    with ThreadPoolExecutor(max_workers=sessions) as clients:
+        start = time.perf_counter()
+        results = list(clients.map(lambda _: hasher.verify("correct horse", stored), range(logins)))
+        elapsed = time.perf_counter() - start
+    assert all(matches for matches, _ in results)
+    return logins / elapsed, elapsed / logins
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=2**14)
+    parser.add_argument("--r", type=int, default=8)
+    parser.add_argument("--p", type=int, default=1)
+    parser.add_argument("--logins", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"scrypt n={args.n} r={args.r} p={args.p}, {args.n * args.r * 128 // 2**20} MiB per hash, {os.cpu_count()} CPUs")
+    for workers in (1, 2, 4, 8):
+        hasher = PasswordHasher(n=args.n, r=args.r, p=args.p, max_workers=workers)
+        stored = hasher.hash("correct horse")
+        rate, latency = logins_per_second(hasher, stored, args.logins)
+        print(f"hash_workers={workers}: {rate:7.1f} logins/s, {latency * 1000:6.1f} ms wall time per login, "
+              f"at most {workers * args.n * args.r * 128 // 2**20} MiB in use")
@@ -0,0 +1,277 @@
+import argparse
+import io
+import os
+import sys
+import time
+from collections import namedtuple
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Run from anywhere: python benchmarks/synthetic_data.py --users 1000 [--plans 1 6] [--months 0 120] [--seed 0] [--database-url URL]
+#
+# Generates users with a profile, a mix of house, car, retirement and customized plans whose loan and
+# saving fields are computed the way the Create Plan page computes them, and monthly saving histories,
+# then bulk-loads them: COPY on PostgreSQL with psycopg2, executemany everywhere else. The same seed and
+# reference date always give the same rows, so benchmark runs against generated data are comparable.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from financial_plan import COUNTRY_DATA, calculate_monthly_saving_batch, calculate_loan_payment_batch
+from monthgrid import add_months, whole_months
+
+# The countries users can pick, with the share of generated users in each
+COUNTRY_SHARES = {'Germany': 0.6, 'United Kingdom': 0.2, 'United States': 0.2}
+COUNTRIES = {
+    name: {'currency': COUNTRY_DATA[name]['Currency'], 'inflation_rate': COUNTRY_DATA[name]['Inflation rate'], 'share': share}
+    for name, share in COUNTRY_SHARES.items()
+}
+
+# goal_type -> share of plans, chance of a loan, chance of a down payment and of a final payment when
+# there is one, loan term in years and interest rate ranges
+PLAN_TYPES = {
+    'House Buyer Savings Plan': {'share': 0.3, 'loan': 0.6, 'down': 0.8, 'final': 0.2, 'years': (15, 30), 'interest': (3.0, 6.0)},
+    'Car Buyer Savings Plan': {'share': 0.3, 'loan': 0.4, 'down': 0.7, 'final': 0.5, 'years': (2, 7), 'interest': (4.0, 9.0)},
+    'Retirement Savings Plan': {'share': 0.15, 'loan': 0.0, 'down': 0.0, 'final': 0.0, 'years': (0, 0), 'interest': (0.0, 0.0)},
+    'Customized Financial Plan': {'share': 0.25, 'loan': 0.1, 'down': 0.3, 'final': 0.2, 'years': (1, 5), 'interest': (5.0, 10.0)},
+}
+
+CUSTOM_GOALS = ["Vacation", "Wedding", "Emergency fund", "New laptop", "Sabbatical", "Renovation"]
+
+SyntheticData = namedtuple('SyntheticData', ['userinfo', 'plans', 'savings'])
+
+def _counts(rng, size, value):
+    # An exact count, or a (low, high) range to draw from uniformly
+    if isinstance(value, int):
+        return np.full(size, value)
+    low, high = value
+    return rng.integers(low, high + 1, size)
+
+def _dates(days):
+    return pd.Series(days.astype('datetime64[D]')).dt.date
+
+def _car_prices():
+    from car_catalog import get_car_catalog
+    catalog = get_car_catalog()
+    cars = [(make, model, catalog.price(make, model)) for make in catalog.makes() for model in catalog.models(make)]
+    # Leave out the scrap-value sales, nobody saves up for those
+    return [car for car in cars if car[2] >= 5000]
+
+def generate(users, plans_per_user=(1, 6), savings_months=(0, 120), seed=0, as_of=None, missed_share=0.1):
+    """
+    Generate users, plans and savings as DataFrames. Users and plans are numbered from 0 in user_id and
+    plan_id, load() maps them to real ids. plans_per_user and savings_months (per plan) are exact
+    counts or (low, high) ranges; missed_share is the share of months without a saving.
+    """
+    rng = np.random.default_rng(seed)
+    as_of = np.datetime64(as_of or date.today(), 'D')
+    this_month = as_of.astype('datetime64[M]')
+
+    # --- USERS ---
+    countries = list(COUNTRIES)
+    country = rng.choice(len(countries), users, p=[COUNTRIES[name]['share'] for name in countries])
+    birthday = as_of - rng.integers(22 * 365, 61 * 365, users).astype('timedelta64[D]')
+    userinfo = pd.DataFrame({
+        'user_id': np.arange(users),
+        'user_nickname': [f"User {i}" for i in range(users)],
+        'user_birthday': _dates(birthday),
+        'user_country': np.array(countries)[country],
+        'user_currency': np.array([COUNTRIES[name]['currency'] for name in countries])[country],
+        'user_subscription': np.where(rng.random(users) < 0.3, "Premium", "Standard"),
+    })
+
+    # --- PLANS ---
+    plan_user = np.repeat(np.arange(users), _counts(rng, users, plans_per_user))
+    count = len(plan_user)
+    types = list(PLAN_TYPES)
+    type_index = rng.choice(len(types), count, p=[PLAN_TYPES[name]['share'] for name in types])
+    settings = {key: np.array([PLAN_TYPES[name][key] for name in types])[type_index] for key in ('loan', 'down', 'final', 'interest')}
+    is_house, is_car, is_retirement, is_custom = (type_index == i for i in range(len(types)))
+
+    plan_birthday = birthday[plan_user]
+    # calculateUserAge
+    current_age = whole_months(plan_birthday, as_of) // 12
+    target_age = np.select(
+        [is_house, is_car, is_retirement],
+        [current_age + rng.integers(3, 16, count), current_age + rng.integers(1, 7, count), np.maximum(67, current_age + 1)],
+        current_age + rng.integers(1, 6, count),
+    )
+    target_age = np.minimum(target_age, 100)
+    # calculateGoalDate
+    goal_date = add_months(plan_birthday, target_age * 12).values.astype('datetime64[D]')
+    goal_month = goal_date.astype('datetime64[M]')
+    # House and customized plans count calendar months, car and retirement plans whole years of age;
+    # a goal in the current month still gets one month to save
+    savings_term_months = np.maximum(np.where(is_house | is_custom, (goal_month - this_month).astype(int), (target_age - current_age) * 12), 1)
+
+    goal_name = np.select([is_house, is_retirement], ["Buy a House", "Retirement Savings Plan"],
+                          np.array(CUSTOM_GOALS)[rng.integers(0, len(CUSTOM_GOALS), count)]).astype(object)
+    make = np.full(count, None, dtype=object)
+    model = np.full(count, None, dtype=object)
+    goal_total = np.select(
+        [is_house, is_retirement],
+        [rng.lognormal(np.log(350000), 0.4, count), rng.integers(300, 1001, count) * 1000.0],
+        rng.integers(20, 301, count) * 100.0,
+    )
+    if is_car.any():
+        cars = _car_prices()
+        picks = rng.integers(0, len(cars), is_car.sum())
+        make[is_car] = [cars[i][0] for i in picks]
+        model[is_car] = [cars[i][1] for i in picks]
+        goal_name[is_car] = [f"{cars[i][0]} {cars[i][1]}" for i in picks]
+        goal_total[is_car] = [cars[i][2] for i in picks]
+    goal_total = np.round(goal_total, 2)
+
+    saving_initial = np.where(rng.random(count) < 0.5, np.round(goal_total * rng.uniform(0, 0.2, count), 2), 0.0)
+    saving_interest = np.where(saving_initial > 0, 1.6, 0.0)
+
+    # Loans, with the down and final payments and the loan amount derived as on the Create Plan page
+    has_loan = rng.random(count) < settings['loan']
+    has_down = has_loan & (rng.random(count) < settings['down'])
+    has_final = has_loan & (rng.random(count) < settings['final'])
+    payment_first_percent = np.where(has_down, rng.integers(10, 31, count), 0).astype(float)
+    payment_last_percent = np.where(has_final, rng.integers(10, 41, count), 0).astype(float)
+    payment_first = np.round(goal_total * payment_first_percent / 100, 2)
+    payment_last = np.round(goal_total * payment_last_percent / 100, 2)
+    loan_amount = np.where(has_loan, np.where(has_down, goal_total - payment_first - payment_last, goal_total - saving_initial), 0.0)
+    low, high = np.array([PLAN_TYPES[name]['years'] for name in types])[type_index].T
+    loan_duration = np.where(has_loan, rng.integers(low, high + 1), 0)
+    interest_low, interest_high = settings['interest'].T
+    loan_interest = np.where(has_loan, np.round(rng.uniform(interest_low, interest_high), 1), 0.0)
+    loan_monthly = np.where(has_loan, np.round(calculate_loan_payment_batch(loan_amount, loan_interest, loan_duration), 2), 0.0)
+    goal_target = np.where(has_loan, np.where(has_down, payment_first, goal_total - loan_amount), goal_total)
+
+    inflation_rate = np.array([COUNTRIES[name]['inflation_rate'] for name in countries])[country][plan_user]
+    goal_target_monthly, _ = calculate_monthly_saving_batch(goal_target, saving_initial, saving_interest, savings_term_months, inflation_rate)
+
+    def radio(flag, applies):
+        return np.where(applies, np.where(flag, "Yes", "No"), None)
+
+    history = _counts(rng, count, savings_months)
+    created_on = (this_month - history.astype('timedelta64[M]')).astype('datetime64[D]')
+    plans = pd.DataFrame({
+        'plan_id': np.arange(count),
+        'user_id': plan_user,
+        'created_on': _dates(created_on),
+        'goal_type': np.array(types)[type_index],
+        'goal_name': goal_name,
+        'goal_name_extra1': make,
+        'goal_name_extra2': model,
+        'goal_age': target_age,
+        'goal_date': _dates(goal_date),
+        'goal_total': goal_total,
+        'goal_target': goal_target,
+        'goal_target_monthly': goal_target_monthly,
+        'saving_initial': saving_initial,
+        'saving_duration': savings_term_months,
+        'saving_interest': saving_interest,
+        'button_loan': radio(has_loan, ~is_retirement),
+        'button_payment_first': radio(has_down, has_loan),
+        'button_payment_last': radio(has_final, has_loan),
+        'payment_first_percent': payment_first_percent,
+        # Retirement plans keep their term here, like the Create Plan page saves them
+        'payment_first': np.where(is_retirement, savings_term_months, payment_first),
+        'payment_last_percent': payment_last_percent,
+        'payment_last': payment_last,
+        'loan_duration': loan_duration,
+        'loan_startdate': _dates(np.select([has_loan, is_retirement], [goal_date, np.datetime64('1900-01-01')], as_of)),
+        'loan_amount': np.round(loan_amount, 2),
+        'loan_interest': loan_interest,
+        'loan_monthly': loan_monthly,
+    })
+
+    # --- SAVINGS ---
+    # One saving per month from the month the plan was created until last month, some months missed
+    saving_plan = np.repeat(np.arange(count), history)
+    month_offset = np.arange(len(saving_plan)) - np.repeat(np.cumsum(history) - history, history)
+    saving_month = created_on.astype('datetime64[M]')[saving_plan] + month_offset
+    monthly = np.where(goal_target_monthly > 0, goal_target_monthly, 50.0)[saving_plan]
+    amount = np.round(np.maximum(monthly * rng.normal(1.0, 0.2, len(saving_plan)), 1.0), 2)
+    kept = rng.random(len(saving_plan)) >= missed_share
+    savings = pd.DataFrame({
+        'user_id': plan_user[saving_plan][kept],
+        'plan_id': saving_plan[kept],
+        'saving_date': _dates(saving_month[kept]),
+        'saving_amount': amount[kept],
+    })
+
+    return SyntheticData(userinfo, plans, savings)
+
+### BULK LOADING ###
+
+def _allocate_ids(conn, column, count):
+    # Take count ids up front so plans and savings can reference them before anything is inserted
+    from sqlalchemy import func, select, text
+    if conn.dialect.name == 'postgresql':
+        statement = text("SELECT nextval(pg_get_serial_sequence(:table, :column)) FROM generate_series(1, :count)")
+        return np.array(conn.execute(statement, {'table': column.table.name, 'column': column.name, 'count': count}).scalars().all())
+    start = conn.execute(select(func.coalesce(func.max(column), 0))).scalar() + 1
+    return np.arange(start, start + count)
+
+def _bulk_insert(conn, table, frame, chunk_size=10000):
+    if frame.empty:
+        return
+    if conn.dialect.driver == 'psycopg2':
+        buffer = io.StringIO()
+        frame.to_csv(buffer, header=False, index=False)
+        buffer.seek(0)
+        cursor = conn.connection.cursor()
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(frame.columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        return
+    records = frame.to_dict('records')
+    for start in range(0, len(records), chunk_size):
+        conn.execute(table.insert(), records[start:start + chunk_size])
+
+def load(engine, data, username_prefix="synthetic", password="synthetic"):
+    """
+    Insert generated data in one transaction. Usernames are <username_prefix>-<n>, all with the same
+    password. Returns the database ids of the generated users and plans, in generated order.
+    """
+    from db import Credential, Userinfo, Plan, Saving, hash_password, query_cache
+
+    # Hashing is deliberately slow, one hash is shared by every generated user
+    password_hash = hash_password(password)
+    with engine.begin() as conn:
+        user_ids = _allocate_ids(conn, Credential.__table__.c.user_id, len(data.userinfo))
+        plan_ids = _allocate_ids(conn, Plan.__table__.c.plan_id, len(data.plans))
+
+        credentials = pd.DataFrame({
+            'user_id': user_ids,
+            'username': [f"{username_prefix}-{i}" for i in range(len(user_ids))],
+            'password': password_hash,
+        })
+        _bulk_insert(conn, Credential.__table__, credentials)
+        _bulk_insert(conn, Userinfo.__table__, data.userinfo.assign(user_id=user_ids))
+        _bulk_insert(conn, Plan.__table__, data.plans.assign(plan_id=plan_ids, user_id=user_ids[data.plans['user_id']]))
+        _bulk_insert(conn, Saving.__table__, data.savings.assign(user_id=user_ids[data.savings['user_id']], plan_id=plan_ids[data.savings['plan_id']]))
+    query_cache.clear()
+    return user_ids, plan_ids
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, required=True)
+    parser.add_argument("--plans", type=int, nargs=2, default=(1, 6), metavar=("LOW", "HIGH"), help="plans per user")
+    parser.add_argument("--months", type=int, nargs=2, default=(0, 120), metavar=("LOW", "HIGH"), help="months of savings per plan")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--as-of", type=date.fromisoformat, help="reference date, defaults to today")
+    parser.add_argument("--username-prefix", help="defaults to synthetic-<seed>")
+    parser.add_argument("--database-url", help="defaults to the database configured for the app")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    # The car catalog is read relative to the repository root
+    os.chdir(ROOT)
+
+    # db reads DATABASE_URL when it is imported
+    import db
+    from migrate import migrate
+    migrate(db.engine)
+
+    start = time.perf_counter()
+    data = generate(args.users, tuple(args.plans), tuple(args.months), seed=args.seed, as_of=args.as_of)
+    generated = time.perf_counter()
+    load(db.engine, data, username_prefix=args.username_prefix or f"synthetic-{args.seed}")
+    print(f"{len(data.userinfo)} users, {len(data.plans)} plans, {len(data.savings)} savings: "
+          f"generated in {generated - start:.1f} s, loaded in {time.perf_counter() - generated:.1f} s")
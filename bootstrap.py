@@ -0,0 +1,113 @@
+import os
+import pandas as pd
+import streamlit as st
+from st_pages import Page, show_pages, hide_pages
+from assets import load_css
+from db import getUserInfo, logout, query_cache, getPoolStats, secretsSection
+from instrumentation import startRun, finishRun, pageTotals
+
+### PAGE SETUP ###
+# Every page starts with setupPage(__file__), which registers the sidebar pages, loads the
+# stylesheet and enforces login and subscription before the page renders anything,
+# and ends with finishPage(), which reports the queries the run made.
+
+# Set show_queries = true in the [debug] secrets for a query report in the sidebar
+debug_config = secretsSection("debug")
+
+PAGES = [
+    Page("Goaldigger.py", "Overview", "🏠"),
+    Page("pages/1_Personal_Information.py", "Personal Information", "📝"),
+    Page("pages/2_Create_Plan.py", "Create Plan", "✨"),
+    Page("pages/5_Investment_Options_Comparison_Calculator.py", "Bank Term Deposit Profit Calculator", ":chart_with_upwards_trend:"),
+    Page("pages/7_Risk_Tolerance_Assessment.py", "Risk Tolerance Assessment", ":moneybag:"),
+    Page("pages/18_options_comparison.py", "Investment Option Comparison", ":question:"),
+    Page("pages/3_Edit_Plan.py", "Edit Plan"),
+    Page("pages/9_Low Risk, Short Term Investments.py", "Low Risk, Short Term Investments"),
+    Page("pages/10_Low Risk, Medium Term Investments.py", "Low Risk, Medium Term Investments"),
+    Page("pages/11_Low Risk, Long Term Investments.py", "Low Risk, Long Term Investments"),
+    Page("pages/12_Medium Risk, Short Term Investments.py", "Medium Risk, Short Term Investments"),
+    Page("pages/13_Medium Risk, Medium Term Investments.py", "Medium Risk, Medium Term Investments"),
+    Page("pages/14_Medium Risk, Long Term Investments.py", "Medium Risk, Long Term Investments"),
+    Page("pages/15_High Risk, Short Term Investments.py", "High Risk, Short Term Investments"),
+    Page("pages/16_High Risk, Medium Term Investments.py", "High Risk, Medium Term Investments"),
+    Page("pages/17_High Risk, Long Term Investments.py", "High Risk, Long Term Investments"),
+    Page("pages/20_Share_Your_Feedback.py", "Share Your Feedback", "😃")
+]
+
+HIDDEN_PAGES = ["Low Risk, Short Term Investments", "Low Risk, Medium Term Investments", "Low Risk, Long Term Investments", "Medium Risk, Short Term Investments", "Medium Risk, Medium Term Investments", "Medium Risk, Long Term Investments", "High Risk, Short Term Investments", "High Risk, Medium Term Investments", "High Risk, Long Term Investments", "Edit Plan"]
+
+def showChosenPages():
+    # show_pages rewrites the app's page registry, so once per session is enough;
+    # hide_pages only injects CSS into the current run and has to be repeated
+    if not st.session_state.get('pages_registered'):
+        show_pages(PAGES)
+        st.session_state.pages_registered = True
+    hide_pages(HIDDEN_PAGES)
+
+def getSessionProfile():
+    # The profile is kept in session state until it is saved again or the user logs out
+    profile = st.session_state.get('profile')
+    if profile is None or profile.user_id != st.session_state.user_id:
+        profile = getUserInfo(st.session_state.user_id)
+        st.session_state.profile = profile
+    return profile
+
+def clearSessionProfile():
+    st.session_state.pop('profile', None)
+
+def startPageRun(page):
+    # A run that never reached finishPage (st.stop, a page switch) is reported now
+    previous = st.session_state.get('query_run')
+    if previous is not None:
+        finishRun(previous, complete=False)
+    st.session_state.query_run = startRun(page)
+
+def setupPage(page_file, require_login=True, require_premium=False):
+    # Pages pass their __file__, the query report lists runs by file name
+    startPageRun(os.path.basename(page_file))
+    showChosenPages()
+    load_css()
+
+    if not st.session_state.get('logged_in'):
+        if require_login:
+            st.warning("Please log in to access this page.")
+            st.stop()
+        return None
+
+    # Button to logout
+    logout()
+
+    profile = getSessionProfile()
+    if require_premium and (profile is None or profile.user_subscription != "Premium"):
+        st.warning("Upgrade to a Premium to access this function.")
+        st.stop()
+    return profile
+
+def showQueryReport(report):
+    with st.sidebar.expander("🛠️ Queries"):
+        col1, col2 = st.columns(2)
+        col1.metric("Queries this run", report['queries'])
+        col2.metric("Query time", f"{report['query_ms']:.0f} ms")
+        if report['slowest']:
+            st.caption("Slowest statements")
+            st.dataframe(pd.DataFrame(report['slowest']), hide_index=True)
+        if report['repeated']:
+            st.caption("Statements run more than once")
+            st.dataframe(pd.DataFrame(list(report['repeated'].items()), columns=['statement', 'count']), hide_index=True)
+
+        st.caption("All runs since the server started")
+        totals = pd.DataFrame.from_dict(pageTotals(), orient='index')
+        totals['avg_queries'] = totals['queries'] / totals['runs']
+        st.dataframe(totals[['runs', 'avg_queries', 'max_queries', 'query_ms']].round(1))
+        st.caption("Query cache")
+        st.json(query_cache.stats(), expanded=False)
+        st.caption("Connection pool")
+        st.json(getPoolStats(), expanded=False)
+
+def finishPage():
+    run = st.session_state.get('query_run')
+    if run is None:
+        return
+    report = finishRun(run)
+    if debug_config.get("show_queries", False):
+        showQueryReport(report)
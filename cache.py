@@ -0,0 +1,144 @@
+import contextvars
+import threading
+import time
+import inspect
+from collections import OrderedDict
+from functools import wraps
+
+### QUERY CACHE ###
+# Process-wide cache for the read helpers in db.py. Entries expire after a TTL, the
+# least recently used entry is evicted once the cache is full, and every entry is
+# tagged with the rows it was built from (e.g. ('plan', 7)) so that a write only
+# drops the entries it actually touched.
+
+_MISSING = object()
+
+# Event of the cached call running in this context, set when its result must not be stored
+_current_failed = contextvars.ContextVar('query_cache_failed', default=None)
+
+class QueryCache:
+    def __init__(self, ttl=300, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, tags, value)
+        self._keys_by_tag = {}  # tag -> set of keys
+        self._generation = 0  # bumped on every invalidation
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+            expires_at, tags, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, tags, generation=None):
+        with self._lock:
+            # Don't store a value that was loaded while a write invalidated the cache
+            if generation is not None and generation != self._generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, tags, value)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate(self, *tags):
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in self._keys_by_tag.pop(tag, set()):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def stats(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / requests if requests else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+    def cached(self, **tag_args):
+        """
+        Decorator caching a read helper. Each keyword maps a tag name to the argument
+        holding its id, e.g. cached(plan='plan_id') tags entries with ('plan', plan_id).
+        None results are not cached, and neither are results after skip_current(), nor
+        those of outer cached calls built on them.
+        """
+        def decorator(func):
+            signature = inspect.signature(func)
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = (func.__name__,) + tuple(bound.arguments.values())
+
+                value = self.get(key)
+                if value is not _MISSING:
+                    return value
+
+                generation = self._generation
+                failed = threading.Event()
+                token = _current_failed.set(failed)
+                try:
+                    value = func(*args, **kwargs)
+                finally:
+                    _current_failed.reset(token)
+
+                if failed.is_set():
+                    self.skip_current()
+                elif value is not None:
+                    tags = [(tag, bound.arguments[arg]) for tag, arg in tag_args.items()]
+                    self.set(key, value, tags, generation)
+                return value
+
+            return wrapper
+        return decorator
+
+    def skip_current(self):
+        """
+        Keep the result of the cached call running in this context out of the cache, e.g. the
+        fallback a read helper returns when its query failed. Calls made through prefetch count
+        as running in their caller's context.
+        """
+        failed = _current_failed.get()
+        if failed is not None:
+            failed.set()
+
+    def _remove(self, key):
+        _, tags, _ = self._entries.pop(key)
+        for tag in tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
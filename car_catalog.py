@@ -0,0 +1,46 @@
+import os
+import pandas as pd
+import streamlit as st
+
+### CAR PRICE CATALOG ###
+# data/car_prices.xlsx is parsed once per process and indexed by make and model. On the first
+# parse a Parquet copy is written next to it, so later process starts skip openpyxl altogether.
+
+CAR_PRICES_PATH = "data/car_prices.xlsx"
+CAR_PRICES_CACHE_PATH = "data/car_prices.parquet"
+
+class CarCatalog:
+    def __init__(self, df):
+        # make -> {model: price}, in spreadsheet order; the first listed price wins for duplicates
+        self._prices = {}
+        for make, model, price in zip(df['make'], df['model'], df['sellingprice']):
+            self._prices.setdefault(make, {}).setdefault(model, price)
+
+    def makes(self):
+        return list(self._prices)
+
+    def models(self, make):
+        return list(self._prices.get(make, {}))
+
+    def price(self, make, model):
+        return self._prices.get(make, {}).get(model)
+
+def _read_car_prices():
+    try:
+        if os.path.getmtime(CAR_PRICES_CACHE_PATH) >= os.path.getmtime(CAR_PRICES_PATH):
+            return pd.read_parquet(CAR_PRICES_CACHE_PATH)
+    except (OSError, ImportError):
+        pass
+
+    df = pd.read_excel(CAR_PRICES_PATH, usecols=['make', 'model', 'sellingprice'])
+    # Some model names were read as numbers or dates by Excel, plans store them as text
+    df['model'] = df['model'].astype(str)
+    try:
+        df.to_parquet(CAR_PRICES_CACHE_PATH, index=False)
+    except (OSError, ImportError):
+        pass  # Read-only file system or no Parquet engine, parse the spreadsheet again next time
+    return df
+
+@st.cache_resource
+def get_car_catalog():
+    return CarCatalog(_read_car_prices())
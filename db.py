@@ -1,27 +1,83 @@
+import contextvars
+import os
 import streamlit as st
-from sqlalchemy import create_engine, extract, func, Column, Integer, String, Date, ForeignKey, Numeric, Text
+from sqlalchemy import create_engine, make_url, extract, func, Column, Integer, String, Date, ForeignKey, Numeric, Text, Index, UniqueConstraint
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime
-import hashlib
-from st_pages import Page, show_pages, hide_pages
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from cache import QueryCache
+from pool import TimedQueuePool
+from passwords import PasswordHasher
+from instrumentation import instrumentEngine
+import logging
+
+def secretsSection(name):
+    # Optional secrets sections; without a secrets file at all they are simply empty
+    if not st.secrets.load_if_toml_exists():
+        return {}
+    return st.secrets.get(name, {})
 
-# Read database credentials from Streamlit secrets
-db_config = st.secrets["postgresql"]
-DATABASE_URL = f"postgresql+psycopg2://{db_config['username']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['database']}"
+# Read database credentials from Streamlit secrets. The DATABASE_URL environment variable
+# overrides them, e.g. to run the app or the benchmarks against a local stand-in database.
+DATABASE_URL = os.environ.get("DATABASE_URL")
+if DATABASE_URL:
+    db_config = secretsSection("postgresql")
+else:
+    db_config = st.secrets["postgresql"]
+    DATABASE_URL = f"postgresql+psycopg2://{db_config['username']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['database']}"
 
 # Database setup
-engine = create_engine(DATABASE_URL)
+# Pool settings can be tuned in the [postgresql] secrets; statement_timeout is in milliseconds
+connect_args = {}
+if make_url(DATABASE_URL).get_backend_name() == "postgresql":
+    connect_args["options"] = f"-c statement_timeout={db_config.get('statement_timeout', 30000)}"
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=TimedQueuePool,
+    pool_size=db_config.get("pool_size", 5),
+    max_overflow=db_config.get("max_overflow", 10),
+    pool_timeout=db_config.get("pool_timeout", 30),
+    pool_recycle=db_config.get("pool_recycle", 1800),
+    pool_pre_ping=db_config.get("pool_pre_ping", True),
+    connect_args=connect_args
+)
+instrumentEngine(engine)
 Session = sessionmaker(bind=engine)
 Base = declarative_base()
+logger = logging.getLogger('goaldigger.db')
+
+# Cache for the read helpers, invalidated by the write helpers below
+cache_config = secretsSection("cache")
+query_cache = QueryCache(ttl=cache_config.get("ttl", 300), max_entries=cache_config.get("max_entries", 1024))
+
+# Password hashing cost and concurrency can be tuned in the [auth] secrets
+auth_config = secretsSection("auth")
+password_hasher = PasswordHasher(
+    n=auth_config.get("scrypt_n", 2**14),
+    r=auth_config.get("scrypt_r", 8),
+    p=auth_config.get("scrypt_p", 1),
+    max_workers=auth_config.get("hash_workers", 4)
+)
+
+# Reads a page needs together can run side by side, each on its own pooled connection
+prefetch_executor = ThreadPoolExecutor(max_workers=db_config.get("prefetch_workers", 4), thread_name_prefix="db-prefetch")
 
 # User credential model
 class Credential(Base):
     __tablename__ = 'credentials'
     user_id = Column(Integer, primary_key=True)
-    username = Column(String(255), unique=True, nullable=False)
-    password = Column(String(255), unique=True, nullable=False)
+    username = Column(String(255), nullable=False)
+    password = Column(String(255), nullable=False)
+
+    __table_args__ = (
+        # Login looks users up by name, and signup relies on it to reject taken names
+        Index('ix_credentials_username', 'username', unique=True),
+    )
 
 # User information model
 class Userinfo(Base):
@@ -37,7 +93,7 @@ class Userinfo(Base):
 class Plan(Base):
     __tablename__ = 'plans'
     plan_id = Column(Integer, unique=True, primary_key=True)
-    user_id = Column(Integer)
+    user_id = Column(Integer, index=True)
     created_on = Column(Date, nullable=False)
     goal_type = Column(String(255), nullable=False)
     goal_name = Column(String(255), nullable=False)
@@ -67,11 +123,16 @@ class Plan(Base):
 # Saving information model
 class Saving(Base):
     __tablename__ = 'savings'
+    __table_args__ = (
+        # One row per plan and month, its index also serves the lookups by plan and date
+        UniqueConstraint('plan_id', 'saving_date', name='uq_savings_plan_id_saving_date'),
+        Index('ix_savings_user_id_plan_id', 'user_id', 'plan_id'),
+    )
     user_id = Column(Integer)
     plan_id = Column(Integer)
-    saving_id = Column(Integer, unique=True, primary_key=True)
-    saving_date = Column(Date, primary_key=True)
-    saving_amount = Column(Numeric(10, 2), primary_key=True)
+    saving_id = Column(Integer, primary_key=True)
+    saving_date = Column(Date, nullable=False)  # Always the first day of the month
+    saving_amount = Column(Numeric(10, 2), nullable=False)
 
 # Feedback
 class Feedback(Base):
@@ -83,44 +144,76 @@ class Feedback(Base):
     improvements = Column(Text, nullable=True)
     additional_comments = Column(Text, nullable=True)
 
-Base.metadata.create_all(engine)
+# Tables are created and upgraded by migrate.py, importing this module does no database I/O
 
 # Helper functions
 def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+    return password_hasher.hash(password)
 
 def authenticate(username, password):
+    # Only the lookup holds a pooled connection; the password check waits for the hashing
+    # workers, so it runs after the session is closed
     session = Session()
     try:
         user = session.query(Credential).filter_by(username=username).first()
-        if user and user.password == hash_password(password):
-            return user
-        return None
     except SQLAlchemyError as e:
         session.rollback()
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
         return None
     finally:
         session.close()
 
+    if not user:
+        return None
+    matches, needs_rehash = password_hasher.verify(password, user.password)
+    if not matches:
+        return None
+    if needs_rehash:
+        # Upgrade legacy or lower-cost hashes while the plain password is at hand;
+        # if that fails the login still succeeds and the upgrade is retried next time
+        password_hash = hash_password(password)
+        session = Session()
+        try:
+            session.query(Credential).filter_by(user_id=user.user_id).update({'password': password_hash})
+            session.commit()
+            user.password = password_hash
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error("An error occurred: %s", e)
+        finally:
+            session.close()
+    return user
+
 def signup(username, password):
+    # Returns the new user's id, or None if the username is already taken
     session = Session()
     try:
-        if session.query(Credential).filter_by(username=username).first():
-            return False
-        # Add user credential to Credential
-        credential = Credential(username=username, password=hash_password(password))
-        session.add(credential)
+        # Add user credential to Credential in one round trip; a taken username inserts nothing
+        statement = _insert(session, Credential).values(username=username, password=hash_password(password))
+        statement = statement.on_conflict_do_nothing(index_elements=['username']).returning(Credential.user_id)
+        user_id = session.execute(statement).scalar()
         session.commit()
-        return True
+        return user_id
     except SQLAlchemyError as e:
         session.rollback()
-        print(f"An error occurred: {e}")
-        return False
+        logger.error("An error occurred: %s", e)
+        return None
     finally:
         session.close()
 
+def getPoolStats():
+    return engine.pool.stats()
+
+def prefetch(*calls):
+    """
+    Run (function, *args) calls concurrently and return their results in order. Each call runs in a
+    copy of the caller's context, so its queries still count towards the current page run.
+    """
+    futures = [prefetch_executor.submit(contextvars.copy_context().run, function, *args) for function, *args in calls]
+    return [future.result() for future in futures]
+
 ### --- USER INFO ---
+@query_cache.cached(userinfo='user_id')
 def getUserInfo(user_id):
     session = Session()
     try:
@@ -128,7 +221,8 @@ def getUserInfo(user_id):
         return info
     except SQLAlchemyError as e:
         session.rollback()
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
+        query_cache.skip_current()
         return None
     finally:
         session.close()
@@ -149,10 +243,11 @@ def createOrUpdateUserInfo(user_id, user_nickname, user_country, user_currency,
             )
             session.add(info)
         session.commit()
+        query_cache.invalidate(('userinfo', user_id))
         return info
     except SQLAlchemyError as e:
         session.rollback()
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
         return None
     finally:
         session.close()
@@ -198,14 +293,16 @@ def createPlan(user_id, goal_type, goal_name, goal_name_extra1, goal_name_extra2
                     )
         session.add(plan)
         session.commit()
+        query_cache.invalidate(('plans', user_id))
         return plan.plan_id
     except SQLAlchemyError as e:
         session.rollback()
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
         return None
     finally:
         session.close()
 
+@query_cache.cached(plans='user_id')
 def getUserPlans(user_id):
     session = Session()
     try:
@@ -213,11 +310,13 @@ def getUserPlans(user_id):
         return plans
     except SQLAlchemyError as e:
         session.rollback()
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
+        query_cache.skip_current()
         return []
     finally:
         session.close()
 
+@query_cache.cached(plan='plan_id')
 def getPlan(plan_id):
     session = Session()
     try:
@@ -225,7 +324,8 @@ def getPlan(plan_id):
         return plan
     except SQLAlchemyError as e:
         session.rollback()
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
+        query_cache.skip_current()
         return None
     finally:
         session.close()
@@ -263,12 +363,14 @@ def updatePlan(plan_id, goal_name, goal_name_extra1, goal_name_extra2, goal_age,
             plan.loan_amount = round(loan_amount, 2)
             plan.loan_interest = round(loan_interest, 2)
             plan.loan_monthly = round(loan_monthly, 2)
+            user_id = plan.user_id
             session.commit()
+            query_cache.invalidate(('plan', plan_id), ('plans', user_id))
             return True
         return False
     except SQLAlchemyError as e:
         session.rollback()
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
         return False
     finally:
         session.close()
@@ -278,32 +380,87 @@ def deletePlan(plan_id):
     try:
         plan = session.query(Plan).filter_by(plan_id=plan_id).first()
         if plan:
+            user_id = plan.user_id
             session.delete(plan)
             session.commit()
+            query_cache.invalidate(('plan', plan_id), ('plans', user_id))
             return True
         return False
     except SQLAlchemyError as e:
         session.rollback()
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
         return False
     finally:
         session.close()
 
 ### --- SAVINGS ---
+# Savings are stored per plan and month, keyed on the first day of the month
+def _savingMonth(saving_date):
+    saving_date = saving_date.date() if isinstance(saving_date, datetime) else saving_date
+    return saving_date.replace(day=1)
+
+# INSERT ... ON CONFLICT for the database in use
+def _insert(session, model):
+    dialect = sqlite if session.get_bind().dialect.name == 'sqlite' else postgresql
+    return dialect.insert(model)
+
 def createSaving(user_id, plan_id, saving_date, saving_amount):
     session = Session()
     try:
-        saving = Saving(user_id=user_id, plan_id=plan_id, saving_date=saving_date, saving_amount=saving_amount)
-        session.add(saving)
+        # A second deposit in the same month is added to that month's saving
+        statement = _insert(session, Saving).values(user_id=user_id, plan_id=plan_id, saving_date=_savingMonth(saving_date), saving_amount=saving_amount)
+        statement = statement.on_conflict_do_update(
+            index_elements=['plan_id', 'saving_date'],
+            set_={'saving_amount': Saving.saving_amount + statement.excluded.saving_amount}
+        )
+        session.execute(statement)
         session.commit()
+        query_cache.invalidate(('savings', plan_id), ('user_savings', user_id))
         return True
     except SQLAlchemyError as e:
         session.rollback()
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
         return False
     finally:
         session.close()
 
+def createSavingsBulk(user_id, plan_id, savings, chunk_size=1000):
+    """
+    Import (saving_date, saving_amount) pairs, e.g. from a bank export. Deposits are summed per month
+    and added to the month's saving like createSaving does, so deposits already entered are kept.
+    Returns the number of months written.
+    """
+    months = {}
+    for saving_date, saving_amount in savings:
+        month = _savingMonth(saving_date)
+        months[month] = months.get(month, 0) + saving_amount
+
+    rows = [{'user_id': user_id, 'plan_id': plan_id, 'saving_date': month, 'saving_amount': round(amount, 2)}
+            for month, amount in sorted(months.items())]
+    if not rows:
+        return 0
+
+    session = Session()
+    try:
+        # Multi-row INSERT statements, chunked to stay below the bind parameter limit
+        for start in range(0, len(rows), chunk_size):
+            statement = _insert(session, Saving).values(rows[start:start + chunk_size])
+            statement = statement.on_conflict_do_update(
+                index_elements=['plan_id', 'saving_date'],
+                set_={'saving_amount': Saving.saving_amount + statement.excluded.saving_amount}
+            )
+            session.execute(statement)
+        session.commit()
+        query_cache.invalidate(('savings', plan_id), ('user_savings', user_id))
+        return len(rows)
+    except SQLAlchemyError as e:
+        session.rollback()
+        logger.error("An error occurred: %s", e)
+        return None
+    finally:
+        session.close()
+
+@query_cache.cached(savings='plan_id')
 def getSavings(user_id, plan_id):
     session = Session()
     try:
@@ -311,23 +468,57 @@ def getSavings(user_id, plan_id):
         return savings
     except SQLAlchemyError as e:
         session.rollback()
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
+        query_cache.skip_current()
         return []
     finally:
         session.close()
 
+@query_cache.cached(savings='plan_id')
 def getTotalSavings(user_id, plan_id):
     session = Session()
     try:
-        total_savings = session.query(Saving).filter_by(user_id=user_id, plan_id=plan_id).all()
-        return sum([saving.saving_amount for saving in total_savings])
+        total_savings = (
+            session.query(func.coalesce(func.sum(Saving.saving_amount), 0))
+            .filter(Saving.user_id == user_id, Saving.plan_id == plan_id)
+            .scalar()
+        )
+        return total_savings
     except SQLAlchemyError as e:
         session.rollback()
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
+        query_cache.skip_current()
         return 0
     finally:
         session.close()
 
+# Summed savings of every plan of a user, grouped in SQL
+def _totalSavingsByPlanQuery(session, user_id):
+    return (
+        session.query(Saving.plan_id, func.sum(Saving.saving_amount).label('total_saving'))
+        .filter(Saving.user_id == user_id)
+        .group_by(Saving.plan_id)
+    )
+
+@query_cache.cached(user_savings='user_id')
+def getTotalSavingsByPlan(user_id):
+    session = Session()
+    try:
+        total_savings_by_plan = _totalSavingsByPlanQuery(session, user_id).all()
+
+        # Convert the result to a dictionary
+        savings_by_plan = {row.plan_id: row.total_saving for row in total_savings_by_plan}
+
+        return savings_by_plan
+    except SQLAlchemyError as e:
+        session.rollback()
+        logger.error("An error occurred: %s", e)
+        query_cache.skip_current()
+        return {}
+    finally:
+        session.close()
+
+@query_cache.cached(savings='plan_id')
 def getTotalSavingsByYear(plan_id):
     session = Session()
     try:
@@ -347,11 +538,13 @@ def getTotalSavingsByYear(plan_id):
         return savings_by_year
     except SQLAlchemyError as e:
         session.rollback()
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
+        query_cache.skip_current()
         return {}
     finally:
         session.close()
 
+@query_cache.cached(savings='plan_id')
 def getTotalSavingsByMonth(plan_id):
     session = Session()
     try:
@@ -374,11 +567,74 @@ def getTotalSavingsByMonth(plan_id):
         return savings_by_month
     except SQLAlchemyError as e:
         session.rollback()
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
+        query_cache.skip_current()
         return {}
     finally:
         session.close()
 
+### --- OVERVIEW ---
+# Everything the overview page needs for one user, loaded up front so the graph
+# functions don't have to go back to the database
+UserOverview = namedtuple('UserOverview', ['profile', 'plans', 'total_savings'])
+
+@query_cache.cached(userinfo='user_id', plans='user_id', user_savings='user_id')
+def getUserOverview(user_id):
+    session = Session()
+    try:
+        profile = session.query(Userinfo).filter_by(user_id=user_id).first()
+
+        # Plans joined with their summed savings, in a single round trip
+        savings_per_plan = _totalSavingsByPlanQuery(session, user_id).subquery()
+        rows = (
+            session.query(Plan, func.coalesce(savings_per_plan.c.total_saving, 0))
+            .outerjoin(savings_per_plan, savings_per_plan.c.plan_id == Plan.plan_id)
+            .filter(Plan.user_id == user_id)
+            .all()
+        )
+
+        plans = tuple(plan for plan, _ in rows)
+        total_savings = MappingProxyType({plan.plan_id: total for plan, total in rows})
+        return UserOverview(profile, plans, total_savings)
+    except SQLAlchemyError as e:
+        session.rollback()
+        logger.error("An error occurred: %s", e)
+        query_cache.skip_current()
+        return UserOverview(None, (), MappingProxyType({}))
+    finally:
+        session.close()
+
+### --- BUDGET ---
+# The split of a monthly budget across a user's plans, ranked by plan_ids. Solving it takes a while,
+# so it is kept until the plans or their savings change
+@query_cache.cached(plans='user_id', user_savings='user_id')
+def getBudgetAllocation(user_id, plan_ids, monthly_budget, inflation_rate, today):
+    # Imported here, the solver would add to the start of every page that imports db
+    from financial_plan import allocate_budget, priority_weights
+    overview = getUserOverview(user_id)
+    plans_by_id = {plan.plan_id: plan for plan in overview.plans}
+    plans = [plans_by_id[plan_id] for plan_id in plan_ids if plan_id in plans_by_id]
+    return allocate_budget(plans, monthly_budget, inflation_rate, overview.total_savings, priority_weights(len(plans)), today=today)
+
+### --- PLAN DETAILS ---
+# Everything the edit page and its charts need for one plan: the plan, its savings and their totals,
+# summed in SQL, are read side by side
+PlanData = namedtuple('PlanData', ['plan', 'savings', 'total_saving', 'savings_by_year', 'savings_by_month'])
+
+@query_cache.cached(plan='plan_id', savings='plan_id')
+def getPlanData(user_id, plan_id):
+    plan, savings, total_saving, savings_by_year, savings_by_month = prefetch(
+        (getPlan, plan_id),
+        (getSavings, user_id, plan_id),
+        (getTotalSavings, user_id, plan_id),
+        (getTotalSavingsByYear, plan_id),
+        (getTotalSavingsByMonth, plan_id),
+    )
+    if plan is None:
+        return None
+    savings = tuple(sorted(savings, key=lambda saving: saving.saving_date))
+    return PlanData(plan, savings, total_saving, MappingProxyType(savings_by_year), MappingProxyType(savings_by_month))
+
 ### FEEDBACK
 def createFeedback(user_id, overall_experience, positive_feedback, improvements, additional_comments):
     session = Session()
@@ -393,7 +649,7 @@ def createFeedback(user_id, overall_experience, positive_feedback, improvements,
         return True
     except SQLAlchemyError as e:
         session.rollback()
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
         return False
     finally:
         session.close()
@@ -404,6 +660,7 @@ def logout():
     # Button to logout
     if st.sidebar.button("Logout"):
         st.session_state.logged_in = False
+        st.session_state.pop('profile', None)
         st.switch_page("Goaldigger.py")
         st.experimental_rerun()
 
@@ -412,29 +669,3 @@ def backToOverview():
     if st.sidebar.button("Back to Overview"):
         #del st.session_state.edit_plan_id
         st.switch_page("Goaldigger.py")
-
-def showChosenPages():
-    show_pages(
-        [
-            Page("Goaldigger.py", "Overview", "🏠"),
-            Page("pages/1_Personal_Information.py", "Personal Information", "📝"),
-            Page("pages/2_Create_Plan.py", "Create Plan", "✨"),
-            Page("pages/5_Investment_Options_Comparison_Calculator.py", "Bank Term Deposit Profit Calculator", ":chart_with_upwards_trend:"),
-            Page("pages/7_Risk_Tolerance_Assessment.py", "Risk Tolerance Assessment", ":moneybag:"),
-            Page("pages/18_options_comparison.py", "Investment Option Comparison", ":question:"),
-            Page("pages/3_Edit_Plan.py", "Edit Plan"),
-            Page("pages/9_Low Risk, Short Term Investments.py", "Low Risk, Short Term Investments"),
-            Page("pages/10_Low Risk, Medium Term Investments.py", "Low Risk, Medium Term Investments"),
-            Page("pages/11_Low Risk, Long Term Investments.py", "Low Risk, Long Term Investments"),
-            Page("pages/12_Medium Risk, Short Term Investments.py", "Medium Risk, Short Term Investments"),
-            Page("pages/13_Medium Risk, Medium Term Investments.py", "Medium Risk, Medium Term Investments"),
-            Page("pages/14_Medium Risk, Long Term Investments.py", "Medium Risk, Long Term Investments"),
-            Page("pages/15_High Risk, Short Term Investments.py", "High Risk, Short Term Investments"),
-            Page("pages/16_High Risk, Medium Term Investments.py", "High Risk, Medium Term Investments"),
-            Page("pages/17_High Risk, Long Term Investments.py", "High Risk, Long Term Investments"),
-            Page("pages/20_Share_Your_Feedback.py", "Share Your Feedback", "😃")
-        ]
-    )
-
-    hide_pages(["Low Risk, Short Term Investments", "Low Risk, Medium Term Investments", "Low Risk, Long Term Investments", "Low Risk, Short Term Investments", "Medium Risk, Medium Term Investments", "Medium Risk, Long Term Investments", "Medium Risk, Short Term Investments", "High Risk, Medium Term Investments", "High Risk, Long Term Investments", "High Risk, Short Term Investments", "Edit Plan"])
-
@@ -1,7 +1,21 @@
+import logging
 import streamlit as st
 import numpy as np
+import pandas as pd
 import numpy_financial as npf
-from datetime import datetime, timedelta, date
+from datetime import datetime, date
+from collections import namedtuple
+from monthgrid import add_months, month_starts, months_between
+
+logger = logging.getLogger('goaldigger.financial_plan')
+
+### COUNTRIES ###
+# Currency, annual inflation rate in percent and life expectancy of the countries a user can pick
+COUNTRY_DATA = {
+    'Germany': {'Currency': '€', 'Inflation rate': 5.9, 'LifeExpectancy': 80.7},
+    'United Kingdom': {'Currency': '£', 'Inflation rate': 6.8, 'LifeExpectancy': 82.1},
+    'United States': {'Currency': '$', 'Inflation rate': 4.1, 'LifeExpectancy': 77.4}
+}
 
 ### FINANCIAL LOGIC ###
 
@@ -47,10 +61,6 @@ def calculateMonthlyFinalPayment(final_payment_amount, loan_term_years):
     monthly_final_payment = final_payment_amount // loan_term_months if loan_term_years > 0 else 0
     return monthly_final_payment
 
-def filter_models(df, selected_make):
-    models = df[df['make'] == selected_make]['model'].unique()
-    return models
-
 # Calculate mortgage payment
 def calculate_loan_payment(loan_amount, annual_interest_rate, loan_term_years):
     monthly_interest_rate = annual_interest_rate / 100 / 12
@@ -59,6 +69,269 @@ def calculate_loan_payment(loan_amount, annual_interest_rate, loan_term_years):
     total_payment = monthly_payment * number_of_payments
     return float(monthly_payment)
 
+### BATCH CALCULATIONS ###
+# Array versions of the calculations above, for recomputing many plans in one vectorized pass
+
+def calculate_monthly_saving_batch(target_amount, current_savings, current_savings_return, savings_term_months, inflation_rate):
+    """
+    calculate_monthly_saving for arrays: every argument may be a NumPy array, a pandas Series or a scalar
+    broadcast against the others. Returns arrays of monthly savings and inflation-adjusted targets, both
+    rounded half to even to 2 decimals like the scalar version.
+    """
+    target_amount, current_savings, current_savings_return, savings_term_months, inflation_rate = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (target_amount, current_savings, current_savings_return, savings_term_months, inflation_rate))
+    )
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        future_value_target_amount = target_amount * ((1 + inflation_rate / 100) ** (savings_term_months / 12))
+
+        monthly_interest_rate = current_savings_return / 100 / 12
+        number_of_payments = savings_term_months
+
+        current_savings_future_value = np.where(current_savings > 0, current_savings * ((1 + monthly_interest_rate) ** number_of_payments), 0)
+        future_value_needed = future_value_target_amount - current_savings_future_value
+
+        # Without interest the amount is spread evenly, over 3 months if the term is zero (as in the scalar version)
+        payments_without_interest = np.where(number_of_payments == 0, 3, number_of_payments)
+        monthly_saving = np.where(
+            monthly_interest_rate == 0,
+            future_value_needed / payments_without_interest,
+            npf.pmt(monthly_interest_rate, number_of_payments, 0, -future_value_needed)
+        )
+    monthly_saving = np.where(future_value_needed <= 0, 0, monthly_saving)
+
+    has_target = target_amount > 0
+    monthly_saving = np.where(has_target, monthly_saving, 0)
+    future_value_target_amount = np.where(has_target, future_value_target_amount, 0)
+
+    return np.round(monthly_saving, 2), np.round(future_value_target_amount, 2)
+
+def calculate_loan_payment_batch(loan_amount, annual_interest_rate, loan_term_years):
+    """
+    calculate_loan_payment for arrays of loans, returns an array of monthly payments.
+    """
+    monthly_interest_rate = np.asarray(annual_interest_rate, dtype=float) / 100 / 12
+    number_of_payments = np.asarray(loan_term_years, dtype=float) * 12
+    with np.errstate(divide='ignore', invalid='ignore'):
+        monthly_payment = np.abs(npf.pmt(monthly_interest_rate, number_of_payments, np.asarray(loan_amount, dtype=float)))
+    return monthly_payment
+
+PLAN_FINANCIAL_COLUMNS = ['goal_target', 'goal_target_monthly', 'saving_initial', 'saving_interest', 'saving_duration',
+                          'loan_amount', 'loan_interest', 'loan_duration', 'loan_monthly']
+
+def plans_to_frame(plans):
+    """
+    Turn Plan rows into a DataFrame indexed by plan_id with the financial columns as floats.
+    """
+    df = pd.DataFrame(
+        [{column: getattr(plan, column) for column in PLAN_FINANCIAL_COLUMNS} for plan in plans],
+        index=pd.Index([plan.plan_id for plan in plans], name='plan_id'),
+        columns=PLAN_FINANCIAL_COLUMNS
+    )
+    return df.astype(float).fillna(0)
+
+def recalculate_plans(plans_df, inflation_rate):
+    """
+    Recompute the monthly saving, the inflation-adjusted target and the loan payment of every plan in a
+    DataFrame (see plans_to_frame) in one pass, e.g. after the inflation rate changed.
+    """
+    monthly_saving, future_goal_target = calculate_monthly_saving_batch(
+        plans_df['goal_target'], plans_df['saving_initial'], plans_df['saving_interest'], plans_df['saving_duration'], inflation_rate
+    )
+    monthly_loan_payment = calculate_loan_payment_batch(plans_df['loan_amount'], plans_df['loan_interest'], plans_df['loan_duration'])
+
+    return plans_df.assign(
+        goal_target_monthly=monthly_saving,
+        goal_target_future=future_goal_target,
+        # Plans without a loan store 0 instead of the undefined payment of a zero-term loan
+        loan_monthly=np.where(plans_df['loan_amount'] > 0, monthly_loan_payment, 0)
+    )
+
+### GOAL SEEK ###
+
+# ages: candidate goal ages; goal_dates and term_months: the goal date and savings term for each;
+# monthly_savings: the saving each would need; earliest_age / earliest_date: the first age whose
+# saving fits the budget, None if none does
+GoalSeek = namedtuple('GoalSeek', ['ages', 'goal_dates', 'term_months', 'monthly_savings', 'earliest_age', 'earliest_date'])
+
+def solve_earliest_goal(goal_target, current_savings, current_savings_return, inflation_rate, monthly_budget,
+                        user_birthday, current_age, max_age=100, whole_years=False, today=None):
+    """
+    Find the earliest goal age whose monthly saving fits monthly_budget, evaluating every age from
+    current_age + 1 to max_age in one calculate_monthly_saving_batch call, so the whole trade-off
+    curve comes with it. Inflation can make a later goal more expensive per month than an earlier
+    one, so the curve is scanned rather than bisected. The savings term counts calendar months up to
+    the goal date, or whole years of age with whole_years=True, like the Create Plan page does per plan type.
+    """
+    today = today or date.today()
+    ages = np.arange(current_age + 1, max_age + 1)
+    # calculateGoalDate for every age at once
+    goal_dates = add_months(user_birthday, ages * 12)
+    if whole_years:
+        term_months = (ages - current_age) * 12
+    else:
+        term_months = months_between(today, goal_dates)
+    goal_dates = list(goal_dates.date)
+
+    monthly_savings, _ = calculate_monthly_saving_batch(goal_target, current_savings, current_savings_return, term_months, inflation_rate)
+    feasible = np.flatnonzero(monthly_savings <= monthly_budget)
+    if len(feasible) == 0:
+        return GoalSeek(ages, goal_dates, term_months, monthly_savings, None, None)
+    earliest = feasible[0]
+    return GoalSeek(ages, goal_dates, term_months, monthly_savings, int(ages[earliest]), goal_dates[earliest])
+
+### BUDGET ALLOCATION ###
+# Every plan's goal_target_monthly assumes it gets all the saving it needs. With a cap on the total
+# saved per month the plans compete: the allocator decides which goals the budget can reach and how
+# much each plan gets per month. Contributions are constant between two consecutive goal dates, a
+# standing order per plan that only changes when a goal is reached and its share frees up, so the
+# problem grows with the number of plans and not with the number of months.
+
+# plan_ids: the plans in the order given; funded: whether the budget reaches each goal;
+# required: the monthly saving each plan would need on its own; contributions: saving per plan
+# (columns) for every month from now to the last goal date (index); unallocated: budget left per month;
+# optimal: False when the solver stopped at its time limit and more goals might fit the budget
+BudgetAllocation = namedtuple('BudgetAllocation', ['plan_ids', 'funded', 'required', 'contributions', 'unallocated', 'optimal'])
+
+def priority_weights(count):
+    """
+    Weights for allocate_budget for plans ranked from most to least important: every goal counts
+    about one, so as many goals as possible are met, and among allocations meeting equally many
+    goals the higher ranked ones win. The rank bonuses add up to less than one goal.
+    """
+    return 1 + (count - np.arange(count)) / (count * (count + 1))
+
+def _level_contributions(budget_rows, growth, plan_index, lengths, required, needed, monthly_budget, fallback):
+    # Funds the goals with needed > 0 with the least deviation from each plan's required saving,
+    # summed over all months: variables are the contributions x, then their deviations d >= |x - required|
+    from scipy import sparse
+    from scipy.optimize import linprog
+    variables = len(plan_index)
+    funded = needed[plan_index] > 0
+    goal_rows = sparse.coo_matrix((-growth, (plan_index, np.arange(variables))), shape=(len(needed), variables))
+    identity = sparse.identity(variables)
+    payments = linprog(
+        np.concatenate([np.zeros(variables), lengths]),
+        A_ub=sparse.vstack([
+            sparse.hstack([budget_rows, sparse.csr_matrix((budget_rows.shape[0], variables))]),
+            sparse.hstack([goal_rows, sparse.csr_matrix((len(needed), variables))]),
+            sparse.hstack([identity, -identity]),
+            sparse.hstack([-identity, -identity]),
+        ]).tocsc(),
+        b_ub=np.concatenate([np.full(budget_rows.shape[0], monthly_budget), -needed, required[plan_index], -required[plan_index]]),
+        bounds=list(zip(np.zeros(2 * variables), np.concatenate([np.where(funded, monthly_budget, 0), np.full(variables, np.inf)]))),
+        method='highs',
+    )
+    if not payments.success:
+        logger.error("Budget allocation kept the uneven contributions: %s", payments.message)
+        return fallback
+    return payments.x[:variables]
+
+def allocate_budget(plans, monthly_budget, inflation_rate, current_savings=None, priorities=None, today=None, time_limit=0.25):
+    """
+    Split monthly_budget across plans (Plan rows) so that the goals met weigh as much as possible.
+    current_savings maps plan_id to what was saved on top of saving_initial so far; priorities are
+    weights aligned with plans, all 1 by default (most goals met). The targets are adjusted for
+    inflation and the savings grow at each plan's saving_interest up to its goal date, as in
+    calculate_monthly_saving with the term counted from this month.
+
+    A mixed-integer program picks the goals to fund, within time_limit seconds, then a linear program
+    finds the contributions that fund them closest to each plan's own steady monthly saving: with
+    room in the budget every plan saves what it needs on its own, and only a tight budget moves
+    savings between months. Goals the budget can't reach get nothing. When the time limit cuts the
+    search short the best allocation found is returned with optimal False.
+    """
+    # scipy takes a while to import, only pages that allocate a budget load it
+    from scipy import sparse
+    from scipy.optimize import Bounds, LinearConstraint, milp
+
+    today = today or date.today()
+    current_savings = current_savings or {}
+    count = len(plans)
+    plan_ids = [plan.plan_id for plan in plans]
+    weights = np.ones(count) if priorities is None else np.asarray(priorities, dtype=float)
+
+    goal_target = np.array([float(plan.goal_target) for plan in plans])
+    balance = np.array([float(plan.saving_initial) + float(current_savings.get(plan.plan_id, 0)) for plan in plans])
+    saving_interest = np.array([float(plan.saving_interest) for plan in plans])
+    monthly_interest_rate = saving_interest / 100 / 12
+    term_months = months_between(today, [plan.goal_date for plan in plans])
+    horizon = max(int(term_months.max(initial=0)), 1)
+    dates = month_starts(today, horizon)
+
+    required, future_goal_target = calculate_monthly_saving_batch(goal_target, balance, saving_interest, np.maximum(term_months, 0), inflation_rate)
+    future_value_needed = future_goal_target - np.where(balance > 0, balance * (1 + monthly_interest_rate) ** np.maximum(term_months, 0), 0)
+    already_met = (goal_target <= 0) | (future_value_needed <= 0)
+    open_goals = ~already_met & (term_months > 0)
+
+    # Segments run from one goal date to the next; a plan saves in the segments before its goal date
+    edges = np.concatenate([[0], np.unique(term_months[open_goals])])
+    lengths = np.diff(edges)
+    active = open_goals[:, None] & (term_months[:, None] >= edges[None, 1:])
+    plan_index, segment_index = np.nonzero(active)
+    variables = len(plan_index)
+
+    # A month's saving is paid at the end of the month and grows until the goal date, like npf.pmt;
+    # growth summed over a segment's months is what saving 1 a month in that segment adds to the goal
+    months = np.arange(horizon)
+    with np.errstate(over='ignore'):
+        growth = np.where(months[None, :] < term_months[:, None],
+                          (1 + monthly_interest_rate[:, None]) ** (term_months[:, None] - 1 - months[None, :]), 0)
+    segment_growth = np.add.reduceat(growth, edges[:-1], axis=1) if len(lengths) else np.zeros((count, 0))
+
+    funded = already_met.copy()
+    contributions = np.zeros((count, len(lengths)))
+    optimal = True
+    if variables and monthly_budget > 0:
+        # Rows: one budget cap per segment, then one goal per plan (goal value - needed * funded >= 0)
+        budget_rows = sparse.coo_matrix((np.ones(variables), (segment_index, np.arange(variables))), shape=(len(lengths), variables + count))
+        goal_rows = sparse.coo_matrix(
+            (np.concatenate([segment_growth[plan_index, segment_index], -np.where(open_goals, future_value_needed, 0)]),
+             (np.concatenate([plan_index, np.arange(count)]), np.arange(variables + count))),
+            shape=(count, variables + count)
+        )
+        # Implied knapsack rows on the goals alone: the goals due by a segment's end need at least
+        # needed / their largest growth paid in by then, which the budget caps at budget * months
+        max_growth = np.where(open_goals, growth.max(axis=1, initial=0), 1)
+        due_by = open_goals[None, :] & (term_months[None, :] <= edges[1:, None])
+        deadline_rows = sparse.hstack([sparse.csr_matrix((len(lengths), variables)), sparse.csr_matrix(due_by * np.where(open_goals, future_value_needed, 0) / max_growth)])
+        constraints = [
+            LinearConstraint(budget_rows, -np.inf, monthly_budget),
+            LinearConstraint(goal_rows, 0, np.inf),
+            LinearConstraint(deadline_rows, -np.inf, monthly_budget * edges[1:]),
+        ]
+        # The gap stays below half the smallest difference the weights can make (one goal, or one rank)
+        distinct = np.unique(weights[open_goals])
+        smallest_step = min(distinct.min(), np.diff(distinct).min(initial=distinct.min()))
+        selection = milp(
+            np.concatenate([np.zeros(variables), -weights * open_goals]),
+            integrality=np.concatenate([np.zeros(variables), np.ones(count)]),
+            bounds=Bounds(0, np.concatenate([np.full(variables, monthly_budget), open_goals.astype(float)])),
+            constraints=constraints,
+            options={'disp': False, 'time_limit': time_limit, 'mip_rel_gap': smallest_step / 2 / weights[open_goals].sum()},
+        )
+        # At the time limit the best allocation found so far is used
+        optimal = selection.status == 0
+        if selection.x is not None:
+            funded |= open_goals & (np.round(selection.x[variables:]) == 1)
+            contributions[plan_index, segment_index] = _level_contributions(
+                budget_rows.tocsr()[:, :variables], segment_growth[plan_index, segment_index], plan_index, lengths[segment_index],
+                required, np.where(funded & open_goals, future_value_needed, 0), monthly_budget, selection.x[:variables]
+            )
+        else:
+            logger.error("Budget allocation failed: %s", selection.message)
+
+    monthly = np.repeat(contributions, lengths, axis=1)
+    monthly = np.pad(monthly, ((0, 0), (0, horizon - monthly.shape[1])))
+    return BudgetAllocation(
+        plan_ids,
+        funded,
+        required,
+        pd.DataFrame(monthly.T.round(2), index=dates, columns=plan_ids),
+        pd.Series(monthly_budget - monthly.sum(axis=0).round(2), index=dates),
+        optimal,
+    )
+
 # Function to filter plans based on the selected date range
 def filter_plans_by_date(plans, selected_month):
     filtered_plans = []
@@ -68,16 +341,39 @@ def filter_plans_by_date(plans, selected_month):
             filtered_plans.append(plan)
     return filtered_plans
     
+def monthly_savings_series(plans, start_date, end_date):
+    """
+    Total monthly saving of the plans not yet due, for start_date and every calendar month after it
+    up to end_date. Same values as summing filter_plans_by_date for each month, in a single pass.
+    """
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date)
+    months = max(months_between(start, end) + 1, 0)
+    dates = add_months(start, np.arange(months))
+    dates = dates[dates <= end]
+
+    # Plans sorted by due date; the plans still running on a date are those from searchsorted onwards
+    due_dates = pd.to_datetime([plan.goal_date for plan in plans]).values
+    monthly_savings = np.array([float(plan.goal_target_monthly) for plan in plans])
+    order = np.argsort(due_dates, kind='stable')
+    totals_from = np.append(np.cumsum(monthly_savings[order][::-1])[::-1], 0.0)
+    unit = np.result_type(due_dates.dtype, dates.values.dtype)
+    first_running = np.searchsorted(due_dates[order].astype(unit), dates.values.astype(unit), side='left')
+
+    return pd.DataFrame({'Date': dates, 'Total Savings': totals_from[first_running]})
+
 # Function to filter loans based on the selected date range
 def filter_loans_by_date(plans, selected_month):
-    total_monthly_loans = 0
-    for plan in plans:
-        if plan.goal_target_monthly:
-            loan_start_date = plan.loan_startdate.date() if isinstance(plan.loan_startdate, datetime) else plan.loan_startdate
-            loan_end_date = loan_start_date + timedelta(days=plan.loan_duration * 365)
-            if loan_start_date <= selected_month.date() <= loan_end_date:
-                total_monthly_loans += plan.loan_monthly
-    return total_monthly_loans
+    plans = [plan for plan in plans if plan.goal_target_monthly]
+    if not plans:
+        return 0
+
+    # Loans run for loan_duration calendar years from their start date; plans without a start date never match
+    loan_start_dates = pd.to_datetime([plan.loan_startdate for plan in plans]).normalize()
+    loan_end_dates = add_months(loan_start_dates, [(plan.loan_duration or 0) * 12 for plan in plans])
+    selected_day = pd.Timestamp(selected_month).normalize()
+    running = (loan_start_dates <= selected_day) & (selected_day <= loan_end_dates)
+    return sum((plan.loan_monthly for plan, is_running in zip(plans, running) if is_running), 0)
 
 ### CALCULATIONS ###
 
@@ -86,8 +382,8 @@ def calculateGoalDate(user_birthday, goal_age):
     """
     Calculate the goal date by adding goal_age years to the user's birthday.
     """
-    # Calculate the goal date
-    goal_date = user_birthday + timedelta(days=goal_age * 365.25)  # Approximately accounts for leap years
+    # The birthday goal_age years on, February 29 becomes February 28 in common years
+    goal_date = add_months(user_birthday, goal_age * 12).date()
     return goal_date
 
 def calculateSavingDuration(goal_date):
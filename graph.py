@@ -4,10 +4,10 @@ import numpy as np
 import numpy_financial as npf
 import plotly.graph_objs as go
 import plotly.express as px
-from datetime import datetime, timedelta, date
+from datetime import datetime, date
 import matplotlib.pyplot as plt
-from db import getUserPlans, getUserInfo, getTotalSavingsByYear, getPlan, getSavings, getTotalSavingsByMonth
 from financial_plan import calculateMonthlyFinalPayment
+from monthgrid import add_months, month_index
 
 # Custom color palette extracted from the provided image
 custom_colors = [
@@ -29,8 +29,7 @@ custom_colors = [
     '#01FF70'   # Bright green
     ]
 
-def create_custom_legend(user_id, savings_distribution, custom_colors):
-    profile = getUserInfo(user_id)
+def create_custom_legend(profile, savings_distribution, custom_colors):
     st.markdown("   ")
     for i, (name, value) in enumerate(savings_distribution.items()):
         color = custom_colors[i % len(custom_colors)]
@@ -39,8 +38,8 @@ def create_custom_legend(user_id, savings_distribution, custom_colors):
                 unsafe_allow_html=True
         )
 
-def display_piechart(user_id, savings_distribution):
-    profile = getUserInfo(user_id)
+def display_piechart(overview, savings_distribution):
+    profile = overview.profile
     # Pie chart for savings distribution
     fig_pie = px.pie(
     values=list(savings_distribution.values()), 
@@ -69,14 +68,13 @@ def display_piechart(user_id, savings_distribution):
         st.plotly_chart(fig_pie)
 
     with col2:
-        create_custom_legend(user_id, savings_distribution, custom_colors)
+        create_custom_legend(profile, savings_distribution, custom_colors)
 
 # Function to display the timeline
-def display_timeline(user_id):
-    plans = getUserPlans(user_id)
+def display_timeline(overview):
     events = []
 
-    for plan in plans:
+    for plan in overview.plans:
         end_date = plan.goal_date
         if isinstance(end_date, datetime):
             end_date = end_date.date()  # Convert to date if it's a datetime
@@ -122,26 +120,28 @@ def calculate_amortization_schedule(loan_amount, annual_interest_rate, loan_term
     number_of_payments = loan_term_years * 12
     monthly_payment = np.abs(npf.pmt(monthly_interest_rate, number_of_payments, loan_amount))
 
-    schedule = []
-    balance = loan_amount
-    for i in range(number_of_payments):
-        interest = balance * monthly_interest_rate
-        principal = monthly_payment - interest
-        balance -= principal
-        if balance < 0:
-            balance = 0
-        schedule.append({
-            'Month': start_date + pd.DateOffset(months=i),
-            'Payment': monthly_payment,
-            'Principal': principal,
-            'Interest': interest,
-            'Balance': balance
-        })
-    return pd.DataFrame(schedule)
+    # Balance after each payment in closed form (geometric series) instead of a month-by-month loop
+    payments_made = np.arange(number_of_payments + 1)
+    if monthly_interest_rate == 0:
+        balances = loan_amount - monthly_payment * payments_made
+    else:
+        growth = (1 + monthly_interest_rate) ** payments_made
+        balances = loan_amount * growth - monthly_payment * (growth - 1) / monthly_interest_rate
+    balances = np.maximum(balances, 0)
+    interest = balances[:-1] * monthly_interest_rate
+    principal = monthly_payment - interest
+
+    return pd.DataFrame({
+        'Month': add_months(start_date, np.arange(number_of_payments)),
+        'Payment': np.full(number_of_payments, monthly_payment),
+        'Principal': principal,
+        'Interest': interest,
+        'Balance': balances[1:]
+    })
 
 # Define your function to create the graph
-def generate_data_and_plot(plan_id, current_savings, savings_term_months, down_payment_amount, loan_term_years, monthly_saving, monthly_loan_payment, monthly_final_payment, currency_symbol):
-    plan = getPlan(plan_id)
+def generate_data_and_plot(plan_data, current_savings, savings_term_months, down_payment_amount, loan_term_years, monthly_saving, monthly_loan_payment, monthly_final_payment, currency_symbol):
+    plan = plan_data.plan
     savings_term_years = savings_term_months // 12
     yearly_saving = monthly_saving * 12
     yearly_loan_payment = monthly_loan_payment * 12
@@ -155,8 +155,8 @@ def generate_data_and_plot(plan_id, current_savings, savings_term_months, down_p
     yearly_payments = np.zeros(total_years, dtype=float)
     actual_savings = np.zeros(total_years, dtype=float)
 
-    # Get actual savings data by year
-    total_savings_by_year = getTotalSavingsByYear(plan_id)
+    # Actual savings data by year
+    total_savings_by_year = plan_data.savings_by_year
 
     # Initialize cumulative savings and actual savings for the first year
     if total_years > 0:
@@ -230,36 +230,35 @@ def generate_data_and_plot(plan_id, current_savings, savings_term_months, down_p
     st.plotly_chart(fig)
     #st.write(data)
 
-def generate_monthly_data_and_plot(plan_id, current_savings, savings_term_months, down_payment_amount, loan_term_years, monthly_saving, monthly_loan_payment, monthly_final_payment, currency_symbol):
+def generate_monthly_data_and_plot(plan_data, current_savings, savings_term_months, down_payment_amount, loan_term_years, monthly_saving, monthly_loan_payment, monthly_final_payment, currency_symbol):
     if savings_term_months > 12:
         st.error("Savings term months should be less than or equal to 12.")
         return
 
-    plan = getPlan(plan_id)
+    plan = plan_data.plan
 
     # Generate data for plotting
-    plan_month = plan.created_on.month
-    plan_year = plan.created_on.year
     total_months = savings_term_months + (loan_term_years * 12)
-    months = [plan.created_on + pd.DateOffset(months=i) for i in range(total_months)]
+    months = add_months(plan.created_on, np.arange(total_months))
+    month_keys = list(zip(months.year, months.month))
     cumulative_savings = np.zeros(total_months, dtype=float)
     monthly_payments = np.zeros(total_months, dtype=float)
     actual_savings = np.zeros(total_months, dtype=float)
 
-    # Get actual savings data by month
-    total_savings_by_month = getTotalSavingsByMonth(plan_id)
+    # Actual savings data by month
+    total_savings_by_month = plan_data.savings_by_month
 
     # Initialize cumulative savings and actual savings for the first month
     if total_months > 0:
         monthly_payments[0] = monthly_saving if savings_term_months > 0 else 0
         cumulative_savings[0] = monthly_payments[0]
-        actual_savings[0] = current_savings + total_savings_by_month.get((plan_year, plan_month), 0)
+        actual_savings[0] = current_savings + total_savings_by_month.get(month_keys[0], 0)
 
     # Calculate cumulative savings and actual savings for subsequent months
     for i in range(1, savings_term_months):
         cumulative_savings[i] = cumulative_savings[i-1] + monthly_saving
         monthly_payments[i] = monthly_saving
-        actual_savings[i] = actual_savings[i-1] + total_savings_by_month.get((plan_year, plan_month + i), 0)
+        actual_savings[i] = actual_savings[i-1] + total_savings_by_month.get(month_keys[i], 0)
 
     savings_before_loan = cumulative_savings[savings_term_months-1] + monthly_loan_payment
 
@@ -320,9 +319,8 @@ def generate_monthly_data_and_plot(plan_id, current_savings, savings_term_months
 
     st.plotly_chart(fig)
 
-def create_savings_graph(plan_id):
-    plan = getPlan(plan_id)
-    savings = getSavings(plan.user_id, plan_id)
+def create_savings_graph(plan_data):
+    plan, savings = plan_data.plan, plan_data.savings
 
     if not plan or not savings:
         st.error("No data found for this specific plan.")
@@ -373,11 +371,8 @@ def create_savings_graph(plan_id):
     min_y_value = min(df_grouped['Expected Savings'].min(), df_grouped['Actual Savings'].min()) - 200
 
     # Filter data to show only within the last and next 5 months
-    current_date = datetime.now()
-    past_date_limit = current_date - timedelta(days=5*30)  # approximately 5 months ago
-    future_date_limit = current_date + timedelta(days=5*30)  # approximately 5 months from now
-
-    df_filtered = df_grouped[(df_grouped['Month'] >= past_date_limit) & (df_grouped['Month'] <= future_date_limit)]
+    months_from_now = month_index(df_grouped['Month']) - month_index(datetime.now())
+    df_filtered = df_grouped[np.abs(months_from_now) <= 5]
 
     # Create the plot with markers for each data point
     fig = px.line(df_filtered, x='Month', y=['Actual Savings', 'Expected Savings'],
@@ -395,36 +390,21 @@ def create_savings_graph(plan_id):
 
     st.plotly_chart(fig)
 
-def create_monthly_comparison_graph(plan_id):
-    plan = getPlan(plan_id)
+def create_monthly_comparison_graph(plan):
 
     # Calculate monthly_final_payment
     monthly_final_payment = calculateMonthlyFinalPayment(plan.payment_last, plan.loan_duration)
 
-    # Create date ranges
-    saving_end_date = plan.created_on + timedelta(days=plan.saving_duration * 30)
-    loan_end_date = saving_end_date + timedelta(days=plan.loan_duration * 12 * 30)
-    
-    dates = []
-    target_monthly = []
-    loan_monthly = []
-
-    current_date = plan.created_on
-    while current_date <= loan_end_date:
-        dates.append(current_date)
-        if current_date <= saving_end_date:
-            target_monthly.append(plan.goal_target_monthly)
-            loan_monthly.append(0)
-        else:
-            target_monthly.append(monthly_final_payment)
-            loan_monthly.append(plan.loan_monthly)
-        current_date += timedelta(days=30)
+    # One point per calendar month from the plan's start to the end of the loan
+    months = np.arange(plan.saving_duration + plan.loan_duration * 12 + 1)
+    saving_end_date = add_months(plan.created_on, plan.saving_duration)
+    saving_period = months <= plan.saving_duration
 
     # Create a DataFrame for plotting
     df = pd.DataFrame({
-        'Date': dates,
-        'Monthly Saving': target_monthly,
-        'Monthly Loan Payment': loan_monthly
+        'Date': add_months(plan.created_on, months),
+        'Monthly Saving': np.where(saving_period, plan.goal_target_monthly, monthly_final_payment),
+        'Monthly Loan Payment': np.where(saving_period, 0, plan.loan_monthly)
     })
 
     # Ensure all numerical columns are of float type
@@ -444,9 +424,9 @@ def create_monthly_comparison_graph(plan_id):
 
     # Add annotations for the periods with adjusted positions and opacity
     max_value = max(float(df['Monthly Saving'].max()), float(df['Monthly Loan Payment'].max()))
-    fig.add_annotation(x=saving_end_date - timedelta(days=plan.saving_duration * 15), y=max_value * 1.2, 
+    fig.add_annotation(x=add_months(plan.created_on, plan.saving_duration // 2), y=max_value * 1.2, 
                        text="Saving Period", showarrow=False, font=dict(size=14, color="red"), opacity=0.6)
-    fig.add_annotation(x=saving_end_date + timedelta(days=plan.loan_duration * 6 * 30), y=max_value * 1.2, 
+    fig.add_annotation(x=add_months(saving_end_date, plan.loan_duration * 6), y=max_value * 1.2, 
                        text="Loan Period", showarrow=False, font=dict(size=14, color="blue"), opacity=0.6)
     
     # Update the traces to customize the line styles
@@ -454,4 +434,67 @@ def create_monthly_comparison_graph(plan_id):
     fig.update_traces(selector=dict(name='Monthly Saving'), line=dict(dash='solid'))
 
     # Display the plot in Streamlit
-    st.plotly_chart(fig)
\ No newline at end of file
+    st.plotly_chart(fig)
+
+def create_simulation_graph(result, start_date, currency_symbol):
+    # Fan chart of a monte_carlo.simulate_goal result: the middle 50% and 80% of the simulated
+    # balances around the median, against the inflation-adjusted target
+    dates = add_months(start_date, result.months)
+    fig = go.Figure()
+    for low, high, opacity in ((10, 90, 0.15), (25, 75, 0.3)):
+        if low not in result.bands or high not in result.bands:
+            continue
+        fig.add_trace(go.Scatter(x=dates, y=result.bands[high], mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(
+            x=dates, y=result.bands[low], mode='lines', line=dict(width=0), fill='tonexty',
+            fillcolor=f'rgba(31, 119, 180, {opacity})', name=f'{low}th to {high}th percentile', hoverinfo='skip'
+        ))
+    fig.add_trace(go.Scatter(
+        x=dates, y=result.bands.get(50), mode='lines', name='Median savings', line=dict(color='#1f77b4'),
+        hovertemplate='%{x|%b %Y}<br>Median savings: %{y:,.2f} ' + currency_symbol
+    ))
+    fig.add_trace(go.Scatter(
+        x=dates, y=result.target, mode='lines', name='Target incl. inflation', line=dict(color='red', dash='dash'),
+        hovertemplate='%{x|%b %Y}<br>Target: %{y:,.2f} ' + currency_symbol
+    ))
+
+    fig.update_layout(
+        title='Simulated Savings',
+        xaxis_title='Date',
+        yaxis_title=f'Savings ({currency_symbol})',
+        legend_title='',
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        showlegend=True
+    )
+
+    st.plotly_chart(fig)
+
+def create_budget_allocation_graph(allocation, goal_names, monthly_budget, currency_symbol):
+    # Stacked monthly saving per plan from financial_plan.allocate_budget, under the budget line
+    fig = go.Figure()
+    for plan_id, funded in zip(allocation.plan_ids, allocation.funded):
+        contributions = allocation.contributions[plan_id]
+        if not contributions.any():
+            continue
+        fig.add_trace(go.Scatter(
+            x=contributions.index, y=contributions, mode='lines', stackgroup='savings', line=dict(width=0.5, shape='hv'),
+            name=goal_names[plan_id] + ('' if funded else ' (not reached)'),
+            hovertemplate='%{x|%b %Y}<br>%{y:,.2f} ' + currency_symbol
+        ))
+    fig.add_trace(go.Scatter(
+        x=allocation.unallocated.index, y=[monthly_budget] * len(allocation.unallocated), mode='lines', name='Monthly budget',
+        line=dict(color='red', dash='dash'), hovertemplate='%{x|%b %Y}<br>Budget: %{y:,.2f} ' + currency_symbol
+    ))
+
+    fig.update_layout(
+        title='Monthly Saving per Plan',
+        xaxis_title='Date',
+        yaxis_title=f'Monthly Saving ({currency_symbol})',
+        legend_title='',
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        showlegend=True
+    )
+
+    st.plotly_chart(fig)
@@ -0,0 +1,124 @@
+import contextvars
+import heapq
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from sqlalchemy import event
+
+### QUERY INSTRUMENTATION ###
+# SQLAlchemy cursor events count and time every statement the engine runs. Statements are
+# attributed to the page run that is active in the current context (see startRun), and each
+# finished run is logged as one JSON line and added to per-page totals for the whole process.
+
+SLOWEST_STATEMENTS = 5
+STATEMENT_PREVIEW = 300
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+logger = logging.getLogger('goaldigger')
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(JsonFormatter())
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+class RunStats:
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        self.last_query = self.started
+        self.duration = None
+        self.complete = True
+        self.queries = 0
+        self.query_time = 0.0
+        self.slowest = []  # min-heap of (seconds, sequence, statement)
+        self.statements = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement, seconds):
+        with self._lock:
+            self.queries += 1
+            self.query_time += seconds
+            self.last_query = time.perf_counter()
+            self.statements[statement] += 1
+            entry = (seconds, self.queries, statement[:STATEMENT_PREVIEW])
+            if len(self.slowest) < SLOWEST_STATEMENTS:
+                heapq.heappush(self.slowest, entry)
+            else:
+                heapq.heappushpop(self.slowest, entry)
+
+    def report(self):
+        with self._lock:
+            return {
+                'page': self.page,
+                'complete': self.complete,
+                'run_ms': round((self.duration if self.duration is not None else time.perf_counter() - self.started) * 1000, 2),
+                'queries': self.queries,
+                'query_ms': round(self.query_time * 1000, 2),
+                'slowest': [{'ms': round(seconds * 1000, 2), 'statement': statement}
+                            for seconds, _, statement in sorted(self.slowest, reverse=True)],
+                # The same statement run again in one rerun usually means a lookup that could be shared
+                'repeated': {statement[:STATEMENT_PREVIEW]: count for statement, count in self.statements.items() if count > 1},
+            }
+
+_current_run = contextvars.ContextVar('current_run', default=None)
+_page_totals = {}  # page -> {'runs', 'queries', 'query_ms', 'max_queries'}
+_page_totals_lock = threading.Lock()
+
+def instrumentEngine(engine):
+    # The start time is kept on the statement's execution context, so a statement that fails
+    # leaves nothing behind on the pooled connection
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context.query_start = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - context.query_start
+        run = _current_run.get()
+        if run is not None:
+            run.record(statement, seconds)
+
+def currentRun():
+    return _current_run.get()
+
+def startRun(page):
+    run = RunStats(page)
+    _current_run.set(run)
+    return run
+
+def finishRun(run, complete=True):
+    # Safe to call more than once per run, only the first call counts. A run that ended early
+    # (st.stop, a page switch or an error) is finished by the next one, with its duration
+    # measured up to its last query.
+    if run.duration is not None:
+        return run.report()
+    run.complete = complete
+    run.duration = (time.perf_counter() if complete else run.last_query) - run.started
+    report = run.report()
+    with _page_totals_lock:
+        totals = _page_totals.setdefault(run.page, {'runs': 0, 'queries': 0, 'query_ms': 0.0, 'max_queries': 0})
+        totals['runs'] += 1
+        totals['queries'] += report['queries']
+        totals['query_ms'] += report['query_ms']
+        totals['max_queries'] = max(totals['max_queries'], report['queries'])
+    logger.info('page run', extra={'fields': report})
+    return report
+
+def pageTotals():
+    with _page_totals_lock:
+        return {page: dict(totals) for page, totals in _page_totals.items()}
@@ -0,0 +1,116 @@
+from datetime import datetime
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, select, insert, func, text, inspect
+from db import engine, Base
+
+### SCHEMA MIGRATIONS ###
+# The app never creates or alters tables itself. Run `python migrate.py` once after
+# every deploy; applied versions are recorded in the schema_version table, so running
+# it again only applies the migrations that are missing.
+#
+# Version 1 creates the tables from the current models, so on a fresh database the
+# later migrations find everything in place and have to be no-ops.
+
+schema_version = Table(
+    'schema_version', MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('description', String(255), nullable=False),
+    Column('applied_on', DateTime, nullable=False)
+)
+
+def create_tables(conn):
+    Base.metadata.create_all(conn)
+
+def create_lookup_indexes(conn):
+    for table_name in ('plans', 'savings'):
+        for index in Base.metadata.tables[table_name].indexes:
+            index.create(conn, checkfirst=True)
+
+def fix_savings_keys(conn):
+    # Savings used to have a composite primary key over (saving_id, saving_date, saving_amount).
+    # Only PostgreSQL databases predate this; other backends are fresh stand-ins created by version 1.
+    if conn.dialect.name != 'postgresql':
+        return
+    inspector = inspect(conn)
+
+    # Move every saving to the first day of its month and merge duplicates per plan and month
+    conn.execute(text("""
+        UPDATE savings SET saving_date = date_trunc('month', saving_date)::date
+        WHERE saving_date <> date_trunc('month', saving_date)::date
+    """))
+    conn.execute(text("""
+        UPDATE savings s SET saving_amount = merged.total
+        FROM (
+            SELECT MIN(saving_id) AS keep_id, SUM(saving_amount) AS total
+            FROM savings GROUP BY plan_id, saving_date HAVING COUNT(*) > 1
+        ) merged
+        WHERE s.saving_id = merged.keep_id
+    """))
+    conn.execute(text("""
+        DELETE FROM savings s USING savings other
+        WHERE other.plan_id = s.plan_id AND other.saving_date = s.saving_date AND other.saving_id < s.saving_id
+    """))
+
+    # Surrogate primary key on saving_id, backed by a sequence
+    primary_key = inspector.get_pk_constraint('savings')
+    if primary_key['constrained_columns'] != ['saving_id']:
+        conn.execute(text(f'ALTER TABLE savings DROP CONSTRAINT "{primary_key["name"]}"'))
+        conn.execute(text("ALTER TABLE savings ADD PRIMARY KEY (saving_id)"))
+    for constraint in inspector.get_unique_constraints('savings'):
+        if constraint['column_names'] == ['saving_id']:
+            conn.execute(text(f'ALTER TABLE savings DROP CONSTRAINT "{constraint["name"]}"'))
+    saving_id = next(column for column in inspector.get_columns('savings') if column['name'] == 'saving_id')
+    if saving_id['default'] is None:
+        conn.execute(text("CREATE SEQUENCE IF NOT EXISTS savings_saving_id_seq OWNED BY savings.saving_id"))
+        conn.execute(text("SELECT setval('savings_saving_id_seq', COALESCE((SELECT MAX(saving_id) FROM savings), 0) + 1, false)"))
+        conn.execute(text("ALTER TABLE savings ALTER COLUMN saving_id SET DEFAULT nextval('savings_saving_id_seq')"))
+
+    # One saving per plan and month; its index replaces the plain (plan_id, saving_date) index
+    conn.execute(text("DROP INDEX IF EXISTS ix_savings_plan_id_saving_date"))
+    if not any(constraint['name'] == 'uq_savings_plan_id_saving_date' for constraint in inspector.get_unique_constraints('savings')):
+        conn.execute(text("ALTER TABLE savings ADD CONSTRAINT uq_savings_plan_id_saving_date UNIQUE (plan_id, saving_date)"))
+
+def fix_credential_constraints(conn):
+    # credentials.password used to be unique as well, and username was a unique constraint
+    # rather than the named index the model declares now. As in version 3, only PostgreSQL
+    # databases predate this, and SQLite could not drop the constraints in place anyway.
+    if conn.dialect.name == 'postgresql':
+        for constraint in inspect(conn).get_unique_constraints('credentials'):
+            if constraint['column_names'] in (['password'], ['username']):
+                conn.execute(text(f'ALTER TABLE credentials DROP CONSTRAINT "{constraint["name"]}"'))
+    for index in Base.metadata.tables['credentials'].indexes:
+        index.create(conn, checkfirst=True)
+
+MIGRATIONS = [
+    (1, "Create tables", create_tables),
+    (2, "Add indexes on plans.user_id and savings(user_id, plan_id), savings(plan_id, saving_date)", create_lookup_indexes),
+    (3, "Use saving_id as the savings primary key and allow one saving per plan and month", fix_savings_keys),
+    (4, "Drop the unique constraint on credentials.password and index credentials.username", fix_credential_constraints),
+]
+
+def getSchemaVersion(conn):
+    return conn.execute(select(func.coalesce(func.max(schema_version.c.version), 0))).scalar()
+
+def migrate(engine):
+    with engine.begin() as conn:
+        schema_version.create(conn, checkfirst=True)
+
+    applied = []
+    for version, description, upgrade in MIGRATIONS:
+        # One transaction per migration, so a failure leaves the earlier ones applied
+        with engine.begin() as conn:
+            if conn.dialect.name == 'postgresql':
+                # Serialize concurrent runs, e.g. several containers starting at once
+                conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('goaldigger_migrate'))"))
+            if version <= getSchemaVersion(conn):
+                continue
+            upgrade(conn)
+            conn.execute(insert(schema_version).values(version=version, description=description, applied_on=datetime.now()))
+            applied.append((version, description))
+    return applied
+
+if __name__ == "__main__":
+    applied = migrate(engine)
+    for version, description in applied:
+        print(f"Applied migration {version}: {description}")
+    with engine.connect() as conn:
+        print(f"Database schema is at version {getSchemaVersion(conn)}")
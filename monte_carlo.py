@@ -0,0 +1,72 @@
+import numpy as np
+from collections import namedtuple
+
+### MONTE CARLO SIMULATION ###
+# calculate_monthly_saving assumes one fixed return and one fixed inflation rate. Here both are
+# drawn at random every month for thousands of paths at once, to show how likely a plan is to
+# reach its goal and how wide the range of outcomes is. Paths are rows of one (paths, months)
+# array, so a simulation is a handful of NumPy passes with no Python loop over months.
+
+DEFAULT_PATHS = 10000
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+# probability: share of paths that reach the inflation-adjusted target at the goal date
+# months: 0 (today) to savings_term_months
+# bands: percentile -> balance per month
+# target: target adjusted for inflation at the expected rate, per month
+SimulationResult = namedtuple('SimulationResult', ['probability', 'months', 'bands', 'target'])
+
+def simulate_paths(target_amount, current_savings, monthly_saving, months, expected_return, return_volatility,
+                   inflation_rate, inflation_volatility, paths, rng):
+    """
+    The simulation itself: returns the (paths, months) array of balances and, per path, whether
+    it reached its inflation-adjusted target in the last month.
+    """
+    # Balance after month t is growth_t * (current_savings + monthly_saving * sum(1 / growth_k, k <= t)),
+    # with growth_t the compounded return up to t: the month by month recursion in closed form
+    monthly_return = rng.normal(expected_return / 100 / 12, return_volatility / 100 / np.sqrt(12), (paths, months))
+    growth = np.cumprod(1 + monthly_return, axis=1)
+    balances = growth * (current_savings + monthly_saving * np.cumsum(1 / growth, axis=1))
+
+    # Only the target at the goal date matters for success. Monthly inflation is log-normal, so its
+    # compound over the whole term is log-normal too and one draw per path replaces a month by month path.
+    log_inflation = np.log1p(inflation_rate / 100) / 12
+    final_target = target_amount * np.exp(rng.normal(log_inflation * months, inflation_volatility / 100 / np.sqrt(12) * np.sqrt(months), paths))
+    return balances, balances[:, -1] >= final_target
+
+def summarize(balances, reached, target_amount, current_savings, inflation_rate, percentiles=DEFAULT_PERCENTILES):
+    """
+    SimulationResult from simulated balances; sorts balances in place.
+    """
+    paths, months = balances.shape
+
+    # Sorting every month's balances once is cheaper than np.percentile's selection per percentile;
+    # the bands interpolate linearly between neighbouring paths like np.percentile does
+    balances.sort(axis=0)
+    position = np.asarray(percentiles) / 100 * (paths - 1)
+    lower = np.floor(position).astype(int)
+    upper = np.minimum(lower + 1, paths - 1)
+    fraction = (position - lower)[:, None]
+    bands = balances[lower] + (balances[upper] - balances[lower]) * fraction
+
+    start = np.full(1, float(current_savings))
+    return SimulationResult(
+        float(np.mean(reached)),
+        np.arange(months + 1),
+        {percentile: np.concatenate([start, band]) for percentile, band in zip(percentiles, bands)},
+        target_amount * np.exp(np.log1p(inflation_rate / 100) / 12 * np.arange(months + 1)),
+    )
+
+def simulate_goal(target_amount, current_savings, monthly_saving, savings_term_months,
+                  expected_return, return_volatility, inflation_rate, inflation_volatility=1.0,
+                  paths=DEFAULT_PATHS, seed=0, percentiles=DEFAULT_PERCENTILES):
+    """
+    Simulate saving monthly_saving every month on top of current_savings for savings_term_months.
+    Rates are annual percentages: returns are normal per month around expected_return / 12 (as in
+    calculate_monthly_saving), inflation compounds to inflation_rate a year on average. The same
+    seed always gives the same result.
+    """
+    balances, reached = simulate_paths(target_amount, current_savings, monthly_saving, max(int(savings_term_months), 1),
+                                       expected_return, return_volatility, inflation_rate, inflation_volatility,
+                                       paths, np.random.default_rng(seed))
+    return summarize(balances, reached, target_amount, current_savings, inflation_rate, percentiles)
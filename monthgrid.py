@@ -0,0 +1,84 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+### MONTH GRID ###
+# Plans save and pay monthly, so projections step in calendar months. A month is an integer index,
+# the number of months since January 1970 (numpy's datetime64[M]), and everything converts between
+# dates and indices in whole arrays. The months a plan can fall into are precomputed once; month
+# ranges are slices of that grid instead of dates built one by one, and nothing drifts the way
+# 30-day months or 365-day years do.
+
+FIRST_MONTH = np.datetime64('1900-01', 'M')
+LAST_MONTH = np.datetime64('2199-12', 'M')
+
+# Read-only datetime64[M] grid from FIRST_MONTH to LAST_MONTH
+GRID = np.arange(FIRST_MONTH, LAST_MONTH + 1)
+GRID.flags.writeable = False
+_GRID_OFFSET = int(FIRST_MONTH.astype(int))
+
+def _to_datetime64(value):
+    # Dates, datetimes, Timestamps, strings and arrays or Series of them, as datetime64 in the
+    # resolution pandas gives them
+    if isinstance(value, (pd.Series, pd.Index, np.ndarray, list, tuple)):
+        return np.asarray(pd.to_datetime(value))
+    return pd.Timestamp(value).to_datetime64()
+
+def month_index(value):
+    """
+    Months since January 1970 of a date or an array of dates; an int for a single date.
+    """
+    index = _to_datetime64(value).astype('datetime64[M]').astype(int)
+    return int(index) if np.ndim(index) == 0 else index
+
+def months_between(start, end):
+    """
+    Calendar months from start to end, ignoring the day: January 31 to February 1 is one month.
+    """
+    return month_index(end) - month_index(start)
+
+def whole_months(start, end):
+    """
+    Months completed from start to end: months_between less one when end's day of the month comes
+    before start's, so whole_months(birthday, today) // 12 is the age.
+    """
+    start, end = _to_datetime64(start), _to_datetime64(end)
+    day_of_month = lambda days: days - days.astype('datetime64[M]').astype('datetime64[D]')
+    earlier = day_of_month(end.astype('datetime64[D]')) < day_of_month(start.astype('datetime64[D]'))
+    return months_between(start, end) - earlier.astype(int)
+
+def _grid_slice(first, count):
+    offset = first - _GRID_OFFSET
+    if 0 <= offset and offset + count <= len(GRID):
+        return GRID[offset:offset + count]
+    return np.datetime64(first, 'M') + np.arange(count)
+
+@lru_cache(maxsize=256)
+def _month_starts(first, count):
+    return pd.DatetimeIndex(_grid_slice(first, count).astype('datetime64[ns]'))
+
+def month_starts(start, count):
+    """
+    First days of count months from start's month as a DatetimeIndex, for chart axes. Cached, the
+    same ranges come back on every rerun.
+    """
+    return _month_starts(month_index(start), int(count))
+
+def add_months(start_date, months):
+    """
+    Add months calendar months to start_date, like start_date + pd.DateOffset(months=n), with both
+    broadcast as arrays. Days past the end of a shorter month are clipped to its last day and the
+    time of day is kept. A Timestamp for a single date and number, a DatetimeIndex otherwise, in
+    start_date's resolution as pandas would give it.
+    """
+    start = _to_datetime64(start_date)
+    start_days = start.astype('datetime64[D]')
+    start_months = start_days.astype('datetime64[M]')
+    day = (start_days - start_months.astype('datetime64[D]')).astype(int)
+
+    target_months = start_months + np.asarray(months, dtype=int)
+    days_in_month = ((target_months + 1).astype('datetime64[D]') - target_months.astype('datetime64[D]')).astype(int)
+    days = target_months.astype('datetime64[D]') + np.minimum(day, days_in_month - 1)
+    unit = np.result_type(start.dtype, days.dtype)
+    result = days.astype(unit) + (start - start_days.astype(unit))
+    return pd.Timestamp(result) if np.ndim(result) == 0 else pd.DatetimeIndex(np.ravel(result))
@@ -1,17 +1,7 @@
 import streamlit as st
-from db import showChosenPages, logout
+from bootstrap import setupPage, finishPage
 
-showChosenPages()
-
-logout()
-
-def load_css(file_path):
-    with open(file_path) as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-
-# 加载 CSS 文件
-css_file_path = "data/titlestyle.css"
-load_css(css_file_path)
+setupPage(__file__, require_login=False)
 
 # 页面标题
 st.markdown(
@@ -138,3 +128,5 @@ if st.button("Back to Assessment"):
 
 if st.button("I want to compare options"):
     st.switch_page("pages/18_options_comparison.py")
+
+finishPage()
@@ -0,0 +1,52 @@
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+### PASSWORD HASHING ###
+# Passwords are stored as "scrypt$<n>$<r>$<p>$<salt>$<hash>" with base64 salt and hash, so the
+# cost can be raised later without breaking existing hashes. Older accounts still hold a bare
+# unsalted SHA-256 hex digest; it is accepted once and replaced on the next successful login.
+#
+# scrypt is deliberately slow and needs 128 * n * r bytes of memory per call, so hashing runs on
+# a small thread pool: at most max_workers logins hash at once and the rest wait their turn,
+# which keeps CPU and memory use bounded however many sessions log in at the same time.
+
+SCHEME = "scrypt"
+
+class PasswordHasher:
+    def __init__(self, n=2**14, r=8, p=1, salt_size=16, max_workers=4):
+        self.n = n
+        self.r = r
+        self.p = p
+        self.salt_size = salt_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+
+    def _scrypt(self, password, salt, n, r, p):
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r, dklen=32)
+
+    def _hash(self, password):
+        salt = os.urandom(self.salt_size)
+        digest = self._scrypt(password, salt, self.n, self.r, self.p)
+        return "$".join([SCHEME, str(self.n), str(self.r), str(self.p),
+                         base64.b64encode(salt).decode(), base64.b64encode(digest).decode()])
+
+    def _verify(self, password, stored):
+        # Returns (matches, needs_rehash)
+        parts = stored.split("$")
+        if len(parts) == 6 and parts[0] == SCHEME:
+            n, r, p = (int(value) for value in parts[1:4])
+            salt, expected = base64.b64decode(parts[4]), base64.b64decode(parts[5])
+            matches = hmac.compare_digest(self._scrypt(password, salt, n, r, p), expected)
+            return matches, matches and (n, r, p) != (self.n, self.r, self.p)
+
+        # Legacy unsalted SHA-256
+        matches = hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored)
+        return matches, matches
+
+    def hash(self, password):
+        return self._executor.submit(self._hash, password).result()
+
+    def verify(self, password, stored):
+        return self._executor.submit(self._verify, password, stored).result()
@@ -0,0 +1,189 @@
+import glob
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+import streamlit as st
+from monte_carlo import DEFAULT_PATHS, simulate_paths, summarize
+
+### SIMULATION RUNNER ###
+# Long simulations run in worker processes so they don't hold up the script thread. A simulation's
+# paths are split into shards, one per worker, each with its own independent random stream spawned
+# from the seed. The shards write their balances into one memory-mapped file and return only which
+# paths reached the target; when the last shard is done, a worker task reads the file, sorts it into
+# percentile bands and returns the small SimulationResult. Results are kept by a hash of the inputs,
+# so moving a slider back to a value seen before shows the stored result at once.
+
+logger = logging.getLogger('goaldigger.simulation')
+
+# state: 'done', 'running' or 'failed'; result is set when done
+SimulationStatus = namedtuple('SimulationStatus', ['key', 'state', 'result'])
+
+def _simulation_months(inputs):
+    return max(int(inputs['savings_term_months']), 1)
+
+def _run_shard(inputs, path, start, stop, seed_sequence):
+    balances, reached = simulate_paths(
+        inputs['target_amount'], inputs['current_savings'], inputs['monthly_saving'], _simulation_months(inputs),
+        inputs['expected_return'], inputs['return_volatility'], inputs['inflation_rate'], inputs['inflation_volatility'],
+        stop - start, np.random.default_rng(seed_sequence)
+    )
+    shared = np.lib.format.open_memmap(path, mode='r+')
+    shared[start:stop] = balances
+    shared.flush()
+    del shared
+    return reached
+
+def _reduce_shards(inputs, path, reached):
+    try:
+        balances = np.load(path)
+    finally:
+        os.remove(path)
+    return summarize(balances, reached, inputs['target_amount'], inputs['current_savings'], inputs['inflation_rate'])
+
+_FILE_PREFIX = 'goaldigger-simulation-'
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def _remove_stale_files(max_age=3600):
+    # Files left behind by a server process that stopped in the middle of a run
+    for path in glob.glob(os.path.join(tempfile.gettempdir(), f"{_FILE_PREFIX}*.npy")):
+        try:
+            if time.time() - os.path.getmtime(path) > max_age:
+                os.remove(path)
+        except OSError:
+            pass
+
+class SimulationRunner:
+    def __init__(self, max_workers=None, max_entries=256):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_entries = max_entries
+        self._executor = None
+        self._results = OrderedDict()  # key -> SimulationResult, least recently used first
+        self._running = {}  # key -> inputs, file, shard futures, reduce future and an event set when finished
+        # Reentrant: a future that is already done runs its callback right away, while the lock is held
+        self._lock = threading.RLock()
+
+    def _pool(self):
+        # Started on first use; spawned rather than forked, the server process runs many threads
+        if self._executor is None:
+            _remove_stale_files()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    @staticmethod
+    def key(inputs):
+        # Amounts to the cent and rates to a hundredth of a percent, finer slider steps don't change the result
+        rounded = {name: round(float(value), 2) for name, value in inputs.items()}
+        return hashlib.sha256(json.dumps(rounded, sort_keys=True).encode()).hexdigest()
+
+    def submit(self, target_amount, current_savings, monthly_saving, savings_term_months, expected_return, return_volatility,
+               inflation_rate, inflation_volatility=1.0, paths=DEFAULT_PATHS, seed=0, timeout=0):
+        """
+        Start a simulation unless the same inputs are stored or already running, and wait up to timeout
+        seconds for it. Returns a SimulationStatus; poll status(key) until it is done.
+        """
+        inputs = {
+            'target_amount': target_amount, 'current_savings': current_savings, 'monthly_saving': monthly_saving,
+            'savings_term_months': savings_term_months, 'expected_return': expected_return, 'return_volatility': return_volatility,
+            'inflation_rate': inflation_rate, 'inflation_volatility': inflation_volatility, 'paths': paths, 'seed': seed,
+        }
+        key = self.key(inputs)
+        with self._lock:
+            if key not in self._results and key not in self._running:
+                self._start(key, inputs)
+            running = self._running.get(key)
+
+        if running is not None:
+            running['finished'].wait(timeout)
+        return self.status(key)
+
+    def _start(self, key, inputs):
+        # The shards fill one (paths, months) file, allocated here and removed by the reduce task
+        paths = int(inputs['paths'])
+        path = os.path.join(tempfile.gettempdir(), f"{_FILE_PREFIX}{uuid.uuid4().hex}.npy")
+        np.lib.format.open_memmap(path, mode='w+', dtype=float, shape=(paths, _simulation_months(inputs)))
+        shards = min(self.max_workers, paths)
+        seeds = np.random.SeedSequence(inputs['seed']).spawn(shards)
+        bounds = np.linspace(0, paths, shards + 1).astype(int)
+        futures = [self._pool().submit(_run_shard, inputs, path, int(bounds[i]), int(bounds[i + 1]), seeds[i]) for i in range(shards)]
+        self._running[key] = {'inputs': inputs, 'path': path, 'futures': futures, 'reduce': None, 'finished': threading.Event()}
+        for future in futures:
+            future.add_done_callback(lambda future, key=key: self._shard_done(key))
+
+    def _shard_done(self, key):
+        # Runs as each shard finishes, whether or not anyone still polls the key: the last one hands
+        # the file to the reduce task
+        with self._lock:
+            running = self._running.get(key)
+            if running is None or running['reduce'] is not None or not all(future.done() for future in running['futures']):
+                return
+            try:
+                reached = np.concatenate([future.result() for future in running['futures']])
+                running['reduce'] = self._pool().submit(_reduce_shards, running['inputs'], running['path'], reached)
+            except Exception as e:
+                self._fail(key, e)
+                return
+            running['reduce'].add_done_callback(lambda future: self._reduce_done(key, future))
+
+    def _reduce_done(self, key, future):
+        with self._lock:
+            try:
+                result = future.result()
+            except Exception as e:
+                self._fail(key, e)
+                return
+            running = self._running.pop(key, None)
+            if running is None:
+                return
+            self._results[key] = result
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+            running['finished'].set()
+
+    def _fail(self, key, error):
+        # With the lock held: drop the run and its file, status(key) reports it as failed
+        logger.error("Simulation failed: %s", error)
+        if isinstance(error, BrokenProcessPool):
+            self._executor = None
+        running = self._running.pop(key, None)
+        if running is not None:
+            _remove_file(running['path'])
+            running['finished'].set()
+
+    def status(self, key):
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return SimulationStatus(key, 'done', self._results[key])
+            if key in self._running:
+                return SimulationStatus(key, 'running', None)
+            return SimulationStatus(key, 'failed', None)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        # Cancelled runs clean up in their callbacks; remove whatever is left all the same
+        with self._lock:
+            for key in list(self._running):
+                running = self._running.pop(key)
+                _remove_file(running['path'])
+                running['finished'].set()
+
+@st.cache_resource
+def get_simulation_runner():
+    return SimulationRunner()
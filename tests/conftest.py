@@ -0,0 +1,15 @@
+import os
+import sys
+import tempfile
+import pytest
+
+# db reads DATABASE_URL when it is imported, so the tests get their own SQLite file first
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture(scope="session")
+def db():
+    import db
+    from migrate import migrate
+    migrate(db.engine)
+    return db
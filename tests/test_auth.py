@@ -0,0 +1,22 @@
+import hashlib
+
+def test_login_holds_no_connection_while_hashing(db, monkeypatch):
+    user_id = db.signup('legacy-user', 'secret')
+    session = db.Session()
+    # An unsalted SHA-256 hash from before scrypt, upgraded on the next login
+    session.query(db.Credential).filter_by(user_id=user_id).update({'password': hashlib.sha256(b'secret').hexdigest()})
+    session.commit()
+    session.close()
+
+    checked_out = []
+    verify, hash_password = db.password_hasher.verify, db.password_hasher.hash
+    monkeypatch.setattr(db.password_hasher, 'verify', lambda *args: checked_out.append(db.engine.pool.checkedout()) or verify(*args))
+    monkeypatch.setattr(db.password_hasher, 'hash', lambda *args: checked_out.append(db.engine.pool.checkedout()) or hash_password(*args))
+
+    assert db.authenticate('legacy-user', 'secret').user_id == user_id
+    assert checked_out == [0, 0]
+    assert db.authenticate('legacy-user', 'wrong') is None
+
+    session = db.Session()
+    assert session.get(db.Credential, user_id).password != hashlib.sha256(b'secret').hexdigest()
+    session.close()
@@ -0,0 +1,21 @@
+from datetime import date
+from types import SimpleNamespace
+import numpy as np
+from financial_plan import allocate_budget, priority_weights
+
+def make_plan(plan_id, goal_target, goal_date, saving_initial=0, saving_interest=0):
+    return SimpleNamespace(plan_id=plan_id, goal_target=goal_target, goal_date=goal_date,
+                           saving_initial=saving_initial, saving_interest=saving_interest)
+
+def test_large_budget_saves_evenly_instead_of_front_loading():
+    plans = [
+        make_plan(1, 10000, date(2027, 12, 1), saving_initial=1000, saving_interest=4),
+        make_plan(2, 8000, date(2029, 6, 1), saving_interest=2),
+        make_plan(3, 30000, date(2027, 6, 1), saving_initial=2000, saving_interest=3),
+    ]
+    allocation = allocate_budget(plans, 10000, 5.9, priorities=priority_weights(len(plans)), today=date(2026, 10, 18))
+
+    assert allocation.funded.all() and allocation.optimal
+    # Every plan saves what it needs on its own, leaving the rest of the budget unused
+    np.testing.assert_allclose(allocation.contributions.iloc[0].values, allocation.required, rtol=1e-3)
+    assert allocation.contributions.sum(axis=1).max() < 10000 / 2
@@ -0,0 +1,23 @@
+from cache import QueryCache
+
+def test_failed_reads_are_not_cached():
+    cache = QueryCache()
+    calls = []
+
+    @cache.cached(plans='user_id')
+    def getUserPlans(user_id):
+        calls.append(user_id)
+        if len(calls) == 1:
+            # The error path of a read helper: a fallback result that must not stick
+            cache.skip_current()
+            return []
+        return ['plan']
+
+    @cache.cached(plans='user_id')
+    def getUserOverview(user_id):
+        return tuple(getUserPlans(user_id))
+
+    assert getUserOverview(1) == ()
+    assert getUserOverview(1) == ('plan',)
+    assert getUserOverview(1) == ('plan',)
+    assert calls == [1, 1]
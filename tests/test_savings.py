@@ -0,0 +1,11 @@
+from datetime import date
+
+def test_bulk_import_adds_to_existing_deposits(db):
+    user_id, plan_id = 1, 101
+    assert db.createSaving(user_id, plan_id, date(2026, 3, 14), 150)
+
+    # One month overlaps the deposit above, the other is new
+    assert db.createSavingsBulk(user_id, plan_id, [(date(2026, 3, 2), 6), (date(2026, 3, 28), 4), (date(2026, 4, 5), 25)]) == 2
+
+    savings = {saving.saving_date: float(saving.saving_amount) for saving in db.getSavings(user_id, plan_id)}
+    assert savings == {date(2026, 3, 1): 160.0, date(2026, 4, 1): 25.0}
@@ -0,0 +1,20 @@
+import glob
+import os
+import tempfile
+import time
+from simulation_runner import SimulationRunner
+
+def test_unpolled_run_finishes_and_cleans_up():
+    runner = SimulationRunner(max_workers=2)
+    try:
+        # Submitted without waiting and never polled, like a run the slider moved away from
+        key = runner.submit(50000, 1000, 500, 60, 5.0, 10.0, 2.0, paths=400).key
+        deadline = time.monotonic() + 60
+        while runner._running and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert not runner._running
+        assert runner.status(key).state == 'done'
+        assert not glob.glob(os.path.join(tempfile.gettempdir(), "goaldigger-simulation-*.npy"))
+    finally:
+        runner.shutdown()